@@ -3,6 +3,7 @@
 # See: https://spdx.org/licenses/
 
 import typing as ty
+from multiprocessing.shared_memory import SharedMemory
 
 from lava.magma.core.sync.protocol import AbstractSyncProtocol
 from lava.magma.runtime.message_infrastructure.message_infrastructure_interface\
@@ -31,7 +32,7 @@ from lava.magma.core.model.py.ports import (
     PyRefPort, PyVarPort,
 )
 from lava.magma.compiler.channels.interfaces import AbstractCspPort, Channel, \
-    ChannelType
+    ChannelType, ChannelRole
 
 
 class AbstractProcessBuilder(ABC):
@@ -104,6 +105,7 @@ class PyProcessBuilder(AbstractProcessBuilder):
         self.csp_ports: ty.Dict[str, ty.List[AbstractCspPort]] = {}
         self.csp_rs_send_port: ty.Dict[str, CspSendPort] = {}
         self.csp_rs_recv_port: ty.Dict[str, CspRecvPort] = {}
+        self.var_buffers: ty.Dict[int, ty.Tuple[SharedMemory, int]] = {}
 
     @property
     def proc_model(self) -> ty.Type[AbstractPyProcessModel]:
@@ -324,6 +326,20 @@ class PyProcessBuilder(AbstractProcessBuilder):
             if isinstance(port, CspRecvPort):
                 self.csp_rs_recv_port.update({port.name: port})
 
+    def set_var_buffers(
+            self, var_buffers: ty.Dict[int, ty.Tuple[SharedMemory, int]]):
+        """Sets the shared memory buffers through which the runtime gets and
+        sets Vars of the ProcessModel, keyed by Var id. Used by the runtime
+        during initialization (_build_var_buffers).
+
+        Parameters
+        ----------
+        var_buffers : ty.Dict[int, ty.Tuple[SharedMemory, int]]
+            Shared memory and the number of float64 values it holds for the
+            Var
+        """
+        self.var_buffers.update(var_buffers)
+
     def _get_lava_type(self, name: str) -> LavaPyType:
         return getattr(self.proc_model, name)
 
@@ -371,7 +387,7 @@ class PyProcessBuilder(AbstractProcessBuilder):
             port = port_cls(csp_ports, pm, p.shape, lt.d_type)
 
             # Create dynamic PyPort attribute on ProcModel
-            setattr(pm, name, port)
+            pm._register_port(name, port)
             # Create private attribute for port precision
             # setattr(pm, "_" + name + "_p", lt.precision)
 
@@ -392,7 +408,7 @@ class PyProcessBuilder(AbstractProcessBuilder):
             port = port_cls(csp_send, csp_recv, pm, p.shape, lt.d_type)
 
             # Create dynamic RefPort attribute on ProcModel
-            setattr(pm, name, port)
+            pm._register_port(name, port)
 
         # Initialize VarPorts
         for name, p in self.var_ports.items():
@@ -413,7 +429,7 @@ class PyProcessBuilder(AbstractProcessBuilder):
                 p.var_name, csp_send, csp_recv, pm, p.shape, p.d_type)
 
             # Create dynamic VarPort attribute on ProcModel
-            setattr(pm, name, port)
+            pm._register_port(name, port)
 
         for port in self.csp_rs_recv_port.values():
             if "service_to_process_cmd" in port.name:
@@ -453,6 +469,11 @@ class PyProcessBuilder(AbstractProcessBuilder):
 
             pm.var_id_to_var_map[v.var_id] = name
 
+        # Attach shared memory buffers for Var get/set requests
+        for var_id, (shm, num_items) in self.var_buffers.items():
+            pm._var_buffers[var_id] = (
+                shm, np.ndarray((num_items,), np.float64, buffer=shm.buf))
+
         return pm
 
 
@@ -660,6 +681,7 @@ class RuntimeChannelBuilderMp(AbstractChannelBuilder):
     src_process: ty.Union[AbstractRuntimeServiceBuilder, ty.Type["Runtime"]]
     dst_process: ty.Union[AbstractRuntimeServiceBuilder, ty.Type["Runtime"]]
     port_initializer: PortInitializer
+    role: ty.Optional[ChannelRole] = None
 
     def build(self, messaging_infrastructure: MessageInfrastructureInterface) \
             -> Channel:
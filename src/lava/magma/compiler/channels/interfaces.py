@@ -70,3 +70,17 @@ class ChannelType(IntEnum):
     PyPy = 0
     CPy = 1
     PyC = 2
+
+
+class ChannelRole(IntEnum):
+    """Role of a sync channel between the Runtime and a RuntimeService"""
+    CMD = 0
+    """Commands from the Runtime to the RuntimeService"""
+    ACK = 1
+    """Acknowledgements from the RuntimeService to the Runtime"""
+    REQ = 2
+    """Get/set requests from the Runtime to the RuntimeService"""
+    DATA_IN = 3
+    """Data from the RuntimeService to the Runtime"""
+    DATA_OUT = 4
+    """Data from the Runtime to the RuntimeService"""
@@ -2,13 +2,14 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
 import typing as ty
-from queue import Queue, Empty
-from threading import Thread
+from queue import Empty
+from threading import Thread, Condition
 from time import time
 from dataclasses import dataclass
 
 import numpy as np
 from multiprocessing import Pipe, BoundedSemaphore
+from multiprocessing.connection import wait
 
 from lava.magma.compiler.channels.interfaces import (
     Channel,
@@ -57,6 +58,8 @@ class CspSendPort(AbstractCspSendPort):
         self._done = False
         self._array = []
         self._semaphore = None
+        self._error = None
+        self.observer = None
         self.thread = None
 
     @property
@@ -77,6 +80,16 @@ class CspSendPort(AbstractCspSendPort):
 
     def start(self):
         """Starts the port to listen on a thread"""
+        self._prepare()
+        self.thread = Thread(
+            target=self._ack_callback,
+            name="{}.send".format(self._name),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def _prepare(self):
+        """Creates the buffers the port needs before it can listen."""
         self._array = [
             np.ndarray(
                 shape=self._shape,
@@ -86,20 +99,41 @@ class CspSendPort(AbstractCspSendPort):
             for i in range(self._size)
         ]
         self._semaphore = BoundedSemaphore(self._size)
-        self.thread = Thread(
-            target=self._ack_callback,
-            name="{}.send".format(self._name),
-            daemon=True,
-        )
-        self.thread.start()
+
+    @property
+    def _listen_conn(self):
+        """The connection on which the port listens for acknowledgements."""
+        return self._ack
 
     def _ack_callback(self):
         try:
             while not self._done:
                 self._ack.recv_bytes(0)
-                self._semaphore.release()
+                self._notify()
         except EOFError:
             pass
+        except Exception as error:
+            self._fail(error)
+
+    def _notify(self):
+        """Frees a slot of the channel after the receiver acknowledged it."""
+        self._semaphore.release()
+        # Read the observer once; CspSelector.select may reset it from
+        # another thread at any time
+        observer = self.observer
+        if observer is not None:
+            observer()
+
+    def _fail(self, error: Exception):
+        """Records that notifying the port failed, so that send() raises
+        instead of blocking forever on a slot that will never be freed."""
+        self._error = _listen_error(self._name, error)
+        try:
+            # Wake up a send() that waits for a free slot
+            self._semaphore.release()
+        except ValueError:
+            # All slots are free, so no send() is waiting
+            pass
 
     def probe(self):
         """
@@ -114,11 +148,17 @@ class CspSendPort(AbstractCspSendPort):
     def send(self, data):
         """
         Send data on the channel. May block if the channel is already full.
+        The data is copied into the channel buffer, so the caller may reuse
+        the array right after send() returns.
         """
         if data.shape != self._shape:
             raise AssertionError(f"{data.shape=} {self._shape=} Mismatch")
+        if self._error is not None:
+            raise self._error
         self._semaphore.acquire()
-        self._array[self._idx][:] = data[:]
+        if self._error is not None:
+            raise self._error
+        self._array[self._idx][:] = data
         self._idx = (self._idx + 1) % self._size
         self._req.send_bytes(bytes(0))
 
@@ -126,38 +166,79 @@ class CspSendPort(AbstractCspSendPort):
         self._done = True
 
 
-class CspRecvQueue(Queue):
+class CspRecvQueue:
     """
-    Underlying queue which backs the CspRecvPort
+    Single-producer single-consumer queue which backs the CspRecvPort.
+
+    It only counts the tokens that are ready in the shared memory buffer of
+    the channel. The producer (the listener thread of the port) and the
+    consumer (the owner of the port) each only advance their own counter, so
+    putting, probing and taking tokens does not need a lock. The lock is only
+    taken to wake up a consumer that blocks on an empty queue.
     """
 
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._put_count = 0
+        self._get_count = 0
+        self._waiting = False
+        self._error = None
+        self._not_empty = Condition()
+
+    def qsize(self) -> int:
+        return self._put_count - self._get_count
+
+    def put_nowait(self, item=None):
+        self._put_count += 1
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify()
+
+    def abort(self, error: Exception):
+        """Raises 'error' from every current and future wait on the empty
+        queue."""
+        self._error = error
+        with self._not_empty:
+            self._not_empty.notify_all()
+
     def get(self, block=True, timeout=None, peek=False):
         """
-        Implementation from the standard library augmented with 'peek' to
-        optionally return the head element without removing it.
+        Takes a token from the queue, or only checks that there is one if
+        'peek' is True. Blocks on an empty queue unless 'block' is False.
         """
-        with self.not_empty:
+        if not self.qsize():
+            if self._error is not None:
+                raise self._error
             if not block:
-                if not self._qsize():
-                    raise Empty
-            elif timeout is None:
-                while not self._qsize():
-                    self.not_empty.wait()
-            elif timeout < 0:
-                raise ValueError("'timeout' must be a non-negative number")
-            else:
-                endtime = time() + timeout
-                while not self._qsize():
-                    remaining = endtime - time()
-                    if remaining <= 0.0:
-                        raise Empty
-                    self.not_empty.wait(remaining)
-            if peek:
-                item = self.queue[0]
-            else:
-                item = self._get()
-                self.not_full.notify()
-            return item
+                raise Empty
+            self._wait(timeout)
+        if not peek:
+            self._get_count += 1
+
+    def _wait(self, timeout=None):
+        with self._not_empty:
+            # Announce the wait before checking again, so that a token put in
+            # the meantime is either seen here or followed by a notify
+            self._waiting = True
+            try:
+                if timeout is None:
+                    while not self.qsize():
+                        if self._error is not None:
+                            raise self._error
+                        self._not_empty.wait()
+                elif timeout < 0:
+                    raise ValueError("'timeout' must be a non-negative number")
+                else:
+                    endtime = time() + timeout
+                    while not self.qsize():
+                        if self._error is not None:
+                            raise self._error
+                        remaining = endtime - time()
+                        if remaining <= 0.0:
+                            raise Empty
+                        self._not_empty.wait(remaining)
+            finally:
+                self._waiting = False
 
 
 class CspRecvPort(AbstractCspRecvPort):
@@ -190,6 +271,8 @@ class CspRecvPort(AbstractCspRecvPort):
         self._done = False
         self._array = []
         self._queue = None
+        self._error = None
+        self.observer = None
         self.thread = None
 
     @property
@@ -210,6 +293,16 @@ class CspRecvPort(AbstractCspRecvPort):
 
     def start(self):
         """Starts the port to listen on a thread"""
+        self._prepare()
+        self.thread = Thread(
+            target=self._req_callback,
+            name="{}.send".format(self._name),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def _prepare(self):
+        """Creates the buffers the port needs before it can listen."""
         self._array = [
             np.ndarray(
                 shape=self._shape,
@@ -219,27 +312,43 @@ class CspRecvPort(AbstractCspRecvPort):
             for i in range(self._size)
         ]
         self._queue = CspRecvQueue(self._size)
-        self.thread = Thread(
-            target=self._req_callback,
-            name="{}.send".format(self._name),
-            daemon=True,
-        )
-        self.thread.start()
+
+    @property
+    def _listen_conn(self):
+        """The connection on which the port listens for new data."""
+        return self._req
 
     def _req_callback(self):
         try:
             while not self._done:
                 self._req.recv_bytes(0)
-                self._queue.put_nowait(0)
+                self._notify()
         except EOFError:
             pass
+        except Exception as error:
+            self._fail(error)
+
+    def _notify(self):
+        """Makes a token available after the sender wrote it."""
+        self._queue.put_nowait(0)
+        # Read the observer once; CspSelector.select may reset it from
+        # another thread at any time
+        observer = self.observer
+        if observer is not None:
+            observer()
+
+    def _fail(self, error: Exception):
+        """Records that notifying the port failed, so that recv() raises
+        instead of blocking forever on data it will never be notified of."""
+        self._error = _listen_error(self._name, error)
+        self._queue.abort(self._error)
 
     def probe(self):
         """
         Returns True if a 'recv' call will not block, and False otherwise.
         Does not block.
         """
-        return self._queue.qsize() > 0
+        return self._queue.qsize() > 0 or self._error is not None
 
     def peek(self):
         """
@@ -250,11 +359,13 @@ class CspRecvPort(AbstractCspRecvPort):
         result = self._array[self._idx].copy()
         return result
 
-    def recv(self):
+    def recv(self, timeout=None):
         """
         Receive from the channel. Blocks if there is no data on the channel.
+        If 'timeout' is given, blocks at most 'timeout' seconds and raises
+        queue.Empty if no data arrived in the meantime.
         """
-        self._queue.get()
+        self._queue.get(timeout=timeout)
         result = self._array[self._idx].copy()
         self._idx = (self._idx + 1) % self._size
         self._ack.send_bytes(bytes(0))
@@ -265,6 +376,106 @@ class CspRecvPort(AbstractCspRecvPort):
         self._done = True
 
 
+def start_csp_ports(ports: ty.Iterable[ty.Union[CspSendPort, CspRecvPort]]):
+    """Starts all given ports like their start() method does, but serves all
+    of them from one listener thread instead of one thread per port."""
+    listeners = {}
+    for port in ports:
+        port._prepare()
+        listeners[port._listen_conn] = port
+    thread = Thread(
+        target=_listen,
+        args=(listeners,),
+        name="csp_ports.listen",
+        daemon=True,
+    )
+    for port in listeners.values():
+        port.thread = thread
+    thread.start()
+
+
+def _listen(listeners: ty.Dict[ty.Any, ty.Union[CspSendPort, CspRecvPort]]):
+    """Notifies each port about every message on its listen connection until
+    the port is joined or the connection is closed. If notifying a port fails,
+    only that port stops being notified and raises the error to its owner."""
+    while listeners:
+        for conn in wait(list(listeners)):
+            port = listeners[conn]
+            try:
+                conn.recv_bytes(0)
+            except EOFError:
+                del listeners[conn]
+                continue
+            try:
+                port._notify()
+            except Exception as error:
+                port._fail(error)
+                del listeners[conn]
+                continue
+            if port._done:
+                del listeners[conn]
+
+
+def _listen_error(name: str, error: Exception) -> RuntimeError:
+    """Returns the error a port raises to its owner after notifying it about
+    a message failed with 'error'."""
+    listen_error = RuntimeError(
+        f"Port '{name}' stopped listening after an error: {error!r}")
+    listen_error.__cause__ = error
+    return listen_error
+
+
+class CspSelector:
+    """
+    Utility class to wait for any of multiple channels to become ready
+    instead of busy-probing each of them in a loop.
+    """
+
+    def __init__(self):
+        self._cv = Condition()
+
+    def _changed(self):
+        with self._cv:
+            self._cv.notify_all()
+
+    @staticmethod
+    def _set_observer(channel_actions, observer):
+        for channel, _ in channel_actions:
+            channel.observer = observer
+
+    def select(
+            self,
+            *args: ty.Tuple[ty.Union[CspSendPort, CspRecvPort],
+                            ty.Callable[[], ty.Any]]
+    ):
+        """
+        Blocks until any of the given channels is ready, then calls the
+        action associated with the first ready channel and returns its result.
+
+        Parameters
+        ----------
+        args : ty.Tuple[CspSendPort | CspRecvPort, ty.Callable[[], ty.Any]]
+            Pairs of a channel and the action to call once it is ready
+        """
+        with self._cv:
+            self._set_observer(args, self._changed)
+            action = self._ready_action(args)
+            while action is None:
+                self._cv.wait()
+                action = self._ready_action(args)
+            self._set_observer(args, None)
+        # The action may block on the channel, so call it without holding
+        # the lock the channel threads need to notify the selector
+        return action()
+
+    @staticmethod
+    def _ready_action(channel_actions):
+        for channel, action in channel_actions:
+            if channel.probe():
+                return action
+        return None
+
+
 class PyPyChannel(Channel):
     """Helper class to create the set of send and recv port and encapsulate
     them inside a common structure. We call this a PyPyChannel"""
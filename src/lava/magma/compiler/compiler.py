@@ -21,7 +21,8 @@ from lava.magma.compiler.builder import PyProcessBuilder, \
     AbstractRuntimeServiceBuilder, RuntimeServiceBuilder, \
     AbstractChannelBuilder, ServiceChannelBuilderMp
 from lava.magma.compiler.builder import RuntimeChannelBuilderMp
-from lava.magma.compiler.channels.interfaces import ChannelType
+from lava.magma.compiler.channels.interfaces import ChannelType, \
+    ChannelRole
 from lava.magma.compiler.executable import Executable
 from lava.magma.compiler.node import NodeConfig, Node
 from lava.magma.compiler.utils import VarInitializer, PortInitializer, \
@@ -671,10 +672,12 @@ class Compiler:
                 rs_id += 1
         return rs_builders, proc_id_to_runtime_service_id_map
 
-    def _create_mgmt_port_initializer(self, name: str) -> PortInitializer:
+    def _create_mgmt_port_initializer(
+            self, name: str, shape: ty.Tuple[int, ...] = (1,)) \
+            -> PortInitializer:
         return PortInitializer(
             name,
-            (1,),
+            shape,
             np.float64,
             'MgmtPort',
             self._compile_config["pypy_channel_size"],
@@ -691,7 +694,8 @@ class Compiler:
                                         rsb[sync_domain],
                                         self._create_mgmt_port_initializer(
                                             f"runtime_to_service_cmd_"
-                                            f"{sync_domain.name}"))
+                                            f"{sync_domain.name}"),
+                                        ChannelRole.CMD)
             sync_channel_builders.append(runtime_to_service_cmd)
 
             service_to_runtime_ack = \
@@ -700,7 +704,8 @@ class Compiler:
                                         Runtime,
                                         self._create_mgmt_port_initializer(
                                             f"service_to_runtime_ack_"
-                                            f"{sync_domain.name}"))
+                                            f"{sync_domain.name}"),
+                                        ChannelRole.ACK)
             sync_channel_builders.append(service_to_runtime_ack)
 
             runtime_to_service_req = \
@@ -709,7 +714,9 @@ class Compiler:
                                         rsb[sync_domain],
                                         self._create_mgmt_port_initializer(
                                             f"runtime_to_service_req_"
-                                            f"{sync_domain.name}"))
+                                            f"{sync_domain.name}",
+                                            shape=(3,)),
+                                        ChannelRole.REQ)
             sync_channel_builders.append(runtime_to_service_req)
 
             service_to_runtime_data = \
@@ -718,7 +725,8 @@ class Compiler:
                                         Runtime,
                                         self._create_mgmt_port_initializer(
                                             f"service_to_runtime_data_"
-                                            f"{sync_domain.name}"))
+                                            f"{sync_domain.name}"),
+                                        ChannelRole.DATA_IN)
             sync_channel_builders.append(service_to_runtime_data)
 
             runtime_to_service_data = \
@@ -727,7 +735,8 @@ class Compiler:
                                         rsb[sync_domain],
                                         self._create_mgmt_port_initializer(
                                             f"runtime_to_service_data_"
-                                            f"{sync_domain.name}"))
+                                            f"{sync_domain.name}"),
+                                        ChannelRole.DATA_OUT)
             sync_channel_builders.append(runtime_to_service_data)
 
             for process in sync_domain.processes:
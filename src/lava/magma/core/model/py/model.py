@@ -2,11 +2,15 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
 import typing as ty
+import functools as ft
+import time
 from abc import ABC, abstractmethod
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 
-from lava.magma.compiler.channels.pypychannel import CspSendPort, CspRecvPort
+from lava.magma.compiler.channels.pypychannel import CspSendPort, \
+    CspRecvPort, CspSelector, start_csp_ports
 from lava.magma.core.model.model import AbstractProcessModel
 from lava.magma.core.model.py.ports import AbstractPyPort, PyVarPort
 from lava.magma.runtime.mgmt_token_enums import (
@@ -27,6 +31,10 @@ class AbstractPyProcessModel(AbstractProcessModel, ABC):
         du: int =          LavaPyType(int, np.uint16, precision=12)
     """
 
+    run_yield_interval: int = 100
+    """Number of run() calls in between commands after which the CPU is
+    yielded to other processes."""
+
     def __init__(self, model_id: int, name: str):
         super().__init__(model_id, name)
         self.service_to_process_cmd: ty.Optional[CspRecvPort] = None
@@ -37,10 +45,20 @@ class AbstractPyProcessModel(AbstractProcessModel, ABC):
         self.py_ports: ty.List[AbstractPyPort] = []
         self.var_ports: ty.List[PyVarPort] = []
         self.var_id_to_var_map: ty.Dict[int, ty.Any] = {}
+        self._var_accessors: ty.Dict[
+            int, ty.Tuple[ty.Callable[[], ty.Any],
+                          ty.Callable[[ty.Any], None]]] = {}
+        # Shared memory and float64 view of it per Var id, set by the builder
+        self._var_buffers: ty.Dict[
+            int, ty.Tuple[SharedMemory, np.ndarray]] = {}
+        self._selector: CspSelector = CspSelector()
+        self._var_port_actions: ty.List[
+            ty.Tuple[CspRecvPort, ty.Callable[[], None]]] = []
+        self._has_var_ports: bool = False
 
         self._cmd_handlers = {
-            MGMT_COMMAND.STOP[0]: self._stop,
-            MGMT_COMMAND.PAUSE[0]: self._pause
+            int(MGMT_COMMAND.STOP[0]): self._stop,
+            int(MGMT_COMMAND.PAUSE[0]): self._pause
         }
         if not hasattr(self, 'run'):
             self.run = None
@@ -54,56 +72,65 @@ class AbstractPyProcessModel(AbstractProcessModel, ABC):
         # Handle get/set Var requests from runtime service
         self._handle_get_set_var()
 
+    def _get_var_buffer(self, var_id: int) -> np.ndarray:
+        """Returns the view into the shared buffer of the Var with id
+        'var_id'."""
+        try:
+            return self._var_buffers[var_id][1]
+        except KeyError:
+            raise RuntimeError(
+                f"ProcessModel '{self.name}' has no shared buffer for the Var "
+                f"with id {var_id}.") from None
+
     def _handle_get_var(self):
         """Handles the get Var command from runtime service."""
         # 1. Receive Var ID and retrieve the Var
-        var_id = self.service_to_process_req.recv()[0].item()
-        var_name = self.var_id_to_var_map[var_id]
-        var = getattr(self, var_name)
-
-        # 2. Send Var data
-        data_port = self.process_to_service_data
-        # Header corresponds to number of values
-        # Data is either send once (for int) or one by one (array)
+        var_id = int(self.service_to_process_req.recv()[0])
+        buffer = self._get_var_buffer(var_id)
+        get_var, _ = self._var_accessors[var_id]
+        var = get_var()
+
+        # 2. Write Var data to the shared buffer of the Var
         if isinstance(var, int) or isinstance(var, np.integer):
-            data_port.send(enum_to_np(1))
-            data_port.send(enum_to_np(var))
+            buffer[0] = var
+            num_items = 1
         elif isinstance(var, np.ndarray):
-            # FIXME: send a whole vector (also runtime_service.py)
-            var_iter = np.nditer(var)
-            num_items = int(np.prod(var.shape))
-            data_port.send(enum_to_np(num_items))
-            for value in var_iter:
-                data_port.send(enum_to_np(value, np.float64))
+            num_items = var.size
+            if num_items > buffer.size:
+                # The buffer is sized after the Var of the Process. Report a
+                # larger Var as a negative number of values to the Runtime,
+                # which would otherwise wait for the data forever.
+                self.process_to_service_data.send(enum_to_np(-num_items))
+                return
+            buffer[:num_items] = var.ravel()
+        else:
+            raise RuntimeError("Unsupported type")
+
+        # 3. Send number of values once the buffer holds the data
+        self.process_to_service_data.send(enum_to_np(num_items))
 
     def _handle_set_var(self):
         """Handles the set Var command from runtime service."""
         # 1. Receive Var ID and retrieve the Var
-        var_id = self.service_to_process_req.recv()[0].item()
-        var_name = self.var_id_to_var_map[var_id]
-        var = getattr(self, var_name)
-
-        # 2. Receive Var data
-        data_port = self.service_to_process_data
-        if isinstance(var, int) or isinstance(var, np.integer):
-            # First item is number of items (1) - not needed
-            data_port.recv()
-            # Data to set
-            buffer = data_port.recv()[0]
-            if isinstance(var, int):
-                setattr(self, var_name, buffer.item())
-            else:
-                setattr(self, var_name, buffer.astype(var.dtype))
+        var_id = int(self.service_to_process_req.recv()[0])
+        buffer = self._get_var_buffer(var_id)
+        get_var, set_var = self._var_accessors[var_id]
+        var = get_var()
+
+        # 2. Receive number of values the runtime has written to the shared
+        # buffer of the Var
+        num_items = int(self.service_to_process_data.recv()[0])
+        # The Runtime checks the size before writing. Never read past the
+        # buffer regardless since there is no reply to report an error with.
+        num_items = min(num_items, buffer.size)
+
+        # 3. Set the Var from the buffer
+        if isinstance(var, int):
+            set_var(int(buffer[0]))
+        elif isinstance(var, np.integer):
+            set_var(buffer[0].astype(var.dtype))
         elif isinstance(var, np.ndarray):
-            # First item is number of items
-            num_items = data_port.recv()[0]
-            var_iter = np.nditer(var, op_flags=['readwrite'])
-            # Set data one by one
-            for i in var_iter:
-                if num_items == 0:
-                    break
-                num_items -= 1
-                i[...] = data_port.recv()[0]
+            var.flat[:num_items] = buffer[:num_items]
         else:
             raise RuntimeError("Unsupported type")
 
@@ -115,68 +142,134 @@ class AbstractPyProcessModel(AbstractProcessModel, ABC):
         the corresponding handling methods. The loop ends upon a
         new command from runtime service after all get/set Var requests have
         been handled."""
+        get_req = int(REQ_TYPE.GET[0])
+        set_req = int(REQ_TYPE.SET[0])
+        select = self._selector.select
+        recv_req = self.service_to_process_req.recv
+        req_action = (self.service_to_process_req, lambda: 'req')
+        cmd_action = (self.service_to_process_cmd, lambda: 'cmd')
         while True:
-            # Probe if there is a get/set Var request from runtime service
-            if self.service_to_process_req.probe():
-                # Get the type of the request
-                request = self.service_to_process_req.recv()
-                if self.eq_commands(request, REQ_TYPE.GET):
-                    self._handle_get_var()
-                elif self.eq_commands(request, REQ_TYPE.SET):
-                    self._handle_set_var()
-                else:
-                    raise RuntimeError(f"Unknown request type {request}")
-
-            # End if another command from runtime service arrives
-            if self.service_to_process_cmd.probe():
+            # Wait for a get/set Var request or a new command from the
+            # runtime service; pending requests are served first
+            if select(req_action, cmd_action) == 'cmd':
+                # End if another command from runtime service arrives
                 return
+            # Get the type of the request
+            request = int(recv_req()[0])
+            if request == get_req:
+                self._handle_get_var()
+            elif request == set_req:
+                self._handle_set_var()
+            else:
+                raise RuntimeError(f"Unknown request type {request}")
 
-    # TODO: (PP) use select(..) to service VarPorts instead of a loop
     def _handle_var_ports(self):
         """Handles read/write requests on any VarPorts. The loop ends upon a
         new command from runtime service after all VarPort service requests have
         been handled."""
+        # Wait on the recv channels of all VarPorts and the command channel
+        # and only service the VarPort whose channel became ready
+        select = self._selector.select
+        actions = (*self._var_port_actions,
+                   (self.service_to_process_cmd, lambda: 'cmd'))
         while True:
-            # Loop through read/write requests of each VarPort
-            for vp in self.var_ports:
-                vp.service()
-
-            # End if another command from runtime service arrives
-            if self.service_to_process_cmd.probe():
+            if select(*actions) == 'cmd':
+                # End if another command from runtime service arrives
                 return
 
+    def _build_cmd_table(self) \
+            -> ty.Tuple[ty.List[ty.Optional[ty.Callable]], int]:
+        """Returns the registered command handlers as a list indexed by the
+        command minus the returned offset. Commands are small integers, so
+        this allows to dispatch them without hashing."""
+        cmds = [int(cmd) for cmd in self._cmd_handlers]
+        offset = min(cmds)
+        cmd_table = [None] * (max(cmds) - offset + 1)
+        for cmd, handler in self._cmd_handlers.items():
+            cmd_table[int(cmd) - offset] = handler
+        return cmd_table, offset
+
     def _run(self):
+        cmd_table, cmd_offset = self._build_cmd_table()
+        num_cmds = len(cmd_table)
+        stop_cmd = int(MGMT_COMMAND.STOP[0])
+        run_continuous_cmd = int(MGMT_COMMAND.RUN_CONTINUOUS[0])
+        # Bind everything used per command to locals once. run() is re-read
+        # with every command instead, so a ProcessModel may rebind 'run' on
+        # the instance; this takes effect with the next command.
+        probe = self.service_to_process_cmd.probe
+        recv = self.service_to_process_cmd.recv
+        yield_interval = self.run_yield_interval
         while True:
-            if self.service_to_process_cmd.probe():
-                cmd = self.service_to_process_cmd.recv()[0]
-                if cmd in self._cmd_handlers:
-                    self._cmd_handlers[cmd]()
-                    if cmd == MGMT_COMMAND.STOP[0]:
-                        break
-                else:
-                    raise ValueError(
-                        f"Illegal RuntimeService command! ProcessModels of "
-                        f"type {self.__class__.__qualname__} cannot handle "
-                        f"command: {cmd}")
-            if self.run:
-                self.run()
-
-    def __setattr__(self, key: str, value: ty.Any):
-        self.__dict__[key] = value
-        if isinstance(value, AbstractPyPort):
-            self.py_ports.append(value)
-            # Store all VarPorts for efficient RefPort -> VarPort handling
-            if isinstance(value, PyVarPort):
-                self.var_ports.append(value)
+            # There is nothing to do in between commands, so this blocks
+            # until the next command arrives
+            cmd = int(recv()[0])
+            idx = cmd - cmd_offset
+            handler = cmd_table[idx] if 0 <= idx < num_cmds else None
+            run = self.run
+            if handler is None and run:
+                if cmd >= 0:
+                    # Call run() for the given number of steps, report that
+                    # they are done and serve get/set Var requests until the
+                    # next command arrives
+                    for _ in range(cmd):
+                        run()
+                    self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
+                    self._handle_get_set_var()
+                    continue
+                if cmd == run_continuous_cmd:
+                    # Keep calling run() until the next command arrives, but
+                    # yield the CPU now and then so that a run() with nothing
+                    # to do does not starve the other ProcessModels
+                    num_runs = 0
+                    while not probe():
+                        run()
+                        num_runs += 1
+                        if num_runs % yield_interval == 0:
+                            time.sleep(0)
+                    continue
+            if handler is None:
+                raise ValueError(
+                    f"Illegal RuntimeService command! ProcessModels of "
+                    f"type {self.__class__.__qualname__} cannot handle "
+                    f"command: {cmd}")
+            handler()
+            if cmd == stop_cmd:
+                break
+
+    def _register_port(self, name: str, port: AbstractPyPort):
+        """Assigns a PyPort as attribute 'name' of the ProcessModel and
+        registers it to be started and joined together with the ProcessModel.
+        Ports are registered explicitly by the builder so that plain
+        attribute writes on the ProcessModel are not intercepted."""
+        setattr(self, name, port)
+        self.py_ports.append(port)
+        # Store all VarPorts for efficient RefPort -> VarPort handling
+        if isinstance(port, PyVarPort):
+            self.var_ports.append(port)
 
     def start(self):
-        self.service_to_process_cmd.start()
-        self.process_to_service_ack.start()
-        self.service_to_process_req.start()
-        self.process_to_service_data.start()
-        self.service_to_process_data.start()
+        # Bind the getter and setter of each Var once for get/set requests
+        self._var_accessors = {
+            var_id: (ft.partial(getattr, self, var_name),
+                     ft.partial(setattr, self, var_name))
+            for var_id, var_name in self.var_id_to_var_map.items()}
+        # Pair the recv channel of each VarPort with its service method once
+        self._var_port_actions = [(csp_port, vp.service)
+                                  for vp in self.var_ports
+                                  for csp_port in vp.csp_ports
+                                  if isinstance(csp_port, CspRecvPort)]
+        # All ports are registered by now
+        self._has_var_ports = bool(self.var_ports)
+        # Start all mgmt and PyPort channels with a single listener thread
+        csp_ports = [self.service_to_process_cmd,
+                     self.process_to_service_ack,
+                     self.service_to_process_req,
+                     self.process_to_service_data,
+                     self.service_to_process_data]
         for p in self.py_ports:
-            p.start()
+            csp_ports.extend(p.csp_ports)
+        start_csp_ports(csp_ports)
         self._run()
 
     def join(self):
@@ -199,19 +292,21 @@ class PyLoihiProcessModel(AbstractPyProcessModel):
         super().__init__(model_id, name)
         self.current_ts = 0
         self._cmd_handlers.update({
-            self.Phase.SPK[0]: self._spike,
-            self.Phase.PRE_MGMT[0]: self._pre_mgmt,
-            self.Phase.LRN[0]: self._lrn,
-            self.Phase.POST_MGMT[0]: self._post_mgmt,
-            self.Phase.HOST[0]: self._pause
+            self.Phase.SPK: self._spike,
+            self.Phase.PRE_MGMT: self._pre_mgmt,
+            self.Phase.LRN: self._lrn,
+            self.Phase.POST_MGMT: self._post_mgmt,
+            self.Phase.HOST: self._pause
         })
 
     class Phase:
-        SPK = enum_to_np(1)
-        PRE_MGMT = enum_to_np(2)
-        LRN = enum_to_np(3)
-        POST_MGMT = enum_to_np(4)
-        HOST = enum_to_np(5)
+        """Phases as plain ints; received phase tokens are converted with
+        int(..) once so that they are compared without numpy dispatch."""
+        SPK = 1
+        PRE_MGMT = 2
+        LRN = 3
+        POST_MGMT = 4
+        HOST = 5
 
     # FixMe: (AW) Temporary hack because of protocol difference
     def _pause(self):
@@ -229,7 +324,7 @@ class PyLoihiProcessModel(AbstractPyProcessModel):
             self.run_pre_mgmt()
         self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
         # Handle VarPort requests from RefPorts
-        if len(self.var_ports) > 0:
+        if self._has_var_ports:
             self._handle_var_ports()
 
     def _lrn(self):
@@ -244,9 +339,41 @@ class PyLoihiProcessModel(AbstractPyProcessModel):
             self.run_post_mgmt()
         self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
         # Handle VarPort requests from RefPorts
-        if len(self.var_ports) > 0:
+        if self._has_var_ports:
+            self._handle_var_ports()
+
+    def _ack_phase(self):
+        self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
+
+    def _ack_phase_and_handle_var_ports(self):
+        self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
+        # Handle VarPort requests from RefPorts
+        if self._has_var_ports:
             self._handle_var_ports()
 
+    def __init_subclass__(cls, **kwargs):
+        """Specializes the phase handlers of a subclass. The default guards
+        never enable their phase, so a phase whose guard is not overridden
+        gets a handler that only acknowledges the phase instead of calling
+        the guard on every time step."""
+        super().__init_subclass__(**kwargs)
+        base = PyLoihiProcessModel
+        for guard, handler, no_guard_handler in (
+                ("pre_guard", "_pre_mgmt",
+                 base._ack_phase_and_handle_var_ports),
+                ("lrn_guard", "_lrn", base._ack_phase),
+                ("post_guard", "_post_mgmt",
+                 base._ack_phase_and_handle_var_ports)):
+            guarded_handler = base.__dict__[handler]
+            # Leave handlers alone that a subclass implements itself
+            if getattr(cls, handler) not in (guarded_handler,
+                                             no_guard_handler):
+                continue
+            if getattr(cls, guard) is getattr(base, guard):
+                setattr(cls, handler, no_guard_handler)
+            else:
+                setattr(cls, handler, guarded_handler)
+
     def run_spk(self):
         pass
 
@@ -276,45 +403,46 @@ class PyLoihiProcessModel(AbstractPyProcessModel):
         (service_to_process_cmd). After calling the method of a phase of all
         ProcessModels the runtime service is informed about completion. The
         loop ends when the STOP command is received."""
+        stop_cmd = int(MGMT_COMMAND.STOP[0])
         while True:
             # Probe if there is a new command from the runtime service
             if self.service_to_process_cmd.probe():
-                phase = self.service_to_process_cmd.recv()
-                if self.eq_commands(phase, MGMT_COMMAND.STOP):
+                phase = int(self.service_to_process_cmd.recv()[0])
+                if phase == stop_cmd:
                     self.process_to_service_ack.send(MGMT_RESPONSE.TERMINATED)
                     self.join()
                     return
                 # Spiking phase - increase time step
-                if self.eq_commands(phase, self.Phase.SPK):
+                if phase == self.Phase.SPK:
                     self.current_ts += 1
                     self.run_spk()
                     self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
                 # Pre-management phase
-                elif self.eq_commands(phase, self.Phase.PRE_MGMT):
+                elif phase == self.Phase.PRE_MGMT:
                     # Enable via guard method
                     if self.pre_guard():
                         self.run_pre_mgmt()
                     self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
                     # Handle VarPort requests from RefPorts
-                    if len(self.var_ports) > 0:
+                    if self._has_var_ports:
                         self._handle_var_ports()
                 # Learning phase
-                elif self.eq_commands(phase, self.Phase.LRN):
+                elif phase == self.Phase.LRN:
                     # Enable via guard method
                     if self.lrn_guard():
                         self.run_lrn()
                     self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
                 # Post-management phase
-                elif self.eq_commands(phase, self.Phase.POST_MGMT):
+                elif phase == self.Phase.POST_MGMT:
                     # Enable via guard method
                     if self.post_guard():
                         self.run_post_mgmt()
                     self.process_to_service_ack.send(MGMT_RESPONSE.DONE)
                     # Handle VarPort requests from RefPorts
-                    if len(self.var_ports) > 0:
+                    if self._has_var_ports:
                         self._handle_var_ports()
                 # Host phase - called at the last time step before STOP
-                elif self.eq_commands(phase, self.Phase.HOST):
+                elif phase == self.Phase.HOST:
                     # Handle get/set Var requests from runtime service
                     self._handle_get_set_var()
                 else:
@@ -53,11 +53,20 @@ class PyInPort(AbstractPyPort):
 
 class PyInPortVectorDense(PyInPort):
     def recv(self) -> np.ndarray:
-        return ft.reduce(
-            lambda acc, csp_port: acc + csp_port.recv(),
-            self._csp_recv_ports,
-            np.zeros(self._shape, self._d_type),
-        )
+        if not self._csp_recv_ports:
+            return np.zeros(self._shape, self._d_type)
+        # CspRecvPort.recv() already returns a copy, so the first message
+        # only needs the dtype of adding it to a zero array and the others
+        # can be accumulated into it in place
+        acc = self._csp_recv_ports[0].recv()
+        acc = acc.astype(np.result_type(self._d_type, acc.dtype), copy=False)
+        for csp_port in self._csp_recv_ports[1:]:
+            data = csp_port.recv()
+            if np.can_cast(data.dtype, acc.dtype):
+                acc += data
+            else:
+                acc = acc + data
+        return acc
 
     def peek(self) -> np.ndarray:
         return ft.reduce(
@@ -4,6 +4,7 @@
 from __future__ import annotations
 import typing as ty
 from abc import ABC, abstractmethod
+import functools as ft
 import math
 
 if ty.TYPE_CHECKING:
@@ -21,10 +22,11 @@ class AbstractProcessMember(ABC):
         self._process: ty.Optional[AbstractProcess] = None
         self._name: ty.Optional[str] = None
 
-    @property
+    @ft.cached_property
     def size(self) -> int:
         """Returns the size of the tensor-valued ProcessMember which is the
-        product of all elements of its shape."""
+        product of all elements of its shape. The shape of a ProcessMember
+        does not change so the size is only computed once."""
         return math.prod(self.shape)
 
     @property
@@ -3,6 +3,7 @@
 # See: https://spdx.org/licenses/
 import typing as ty
 from abc import ABC, abstractmethod
+import functools as ft
 import math
 
 from lava.magma.core.process.interfaces import AbstractProcessMember
@@ -12,15 +13,24 @@ from lava.magma.core.process.variable import Var
 
 
 def to_list(obj: ty.Any) -> ty.List[ty.Any]:
-    """If 'obj' is not a list, converts 'obj' into [obj]."""
-    if not isinstance(obj, list):
-        obj = [obj]
-    return obj
+    """If 'obj' is not a list, converts 'obj' into [obj]. Tuples are
+    converted into a list of their elements."""
+    obj_type = type(obj)
+    if obj_type is list:
+        return obj
+    if obj_type is tuple:
+        return list(obj)
+    if isinstance(obj, list):
+        return obj
+    return [obj]
 
 
 def is_disjoint(a: ty.List, b: ty.List):
     """Checks that both lists are disjoint."""
-    return set(a).isdisjoint(set(b))
+    if len(a) > len(b):
+        a, b = b, a
+    # Hash only the larger list and probe it with the smaller one
+    return set(b).isdisjoint(a)
 
 
 class AbstractPort(AbstractProcessMember):
@@ -41,10 +51,20 @@ class AbstractPort(AbstractProcessMember):
     compiler to infer connections between processes.
     """
 
+    # Incremented whenever any connection between ports changes. Invalidates
+    # the cached results of get_src_ports(..) and get_dst_ports(..).
+    _graph_version: int = 0
+
     def __init__(self, shape: ty.Tuple):
         super().__init__(shape)
         self.in_connections: ty.List[AbstractPort] = []
         self.out_connections: ty.List[AbstractPort] = []
+        # Identities of connected ports for O(1) duplicate detection
+        self._in_ids: ty.Set[int] = set()
+        self._out_ids: ty.Set[int] = set()
+        # (graph version, _include_self, ports) of the last traversals
+        self._src_cache: ty.Tuple = (None, None, ())
+        self._dst_cache: ty.Tuple = (None, None, ())
 
     def _validate_ports(
             self,
@@ -54,37 +74,45 @@ class AbstractPort(AbstractProcessMember):
             assert_same_type: bool = False):
         """Checks that each port in 'ports' is of type 'port_type' and that
         shapes of each port is identical to this port's shape."""
-        cls_name = port_type.__name__
-        specific_cls = ports[0].__class__
+        specific_cls = type(ports[0]) if assert_same_type else None
+        shape = self.shape
         for p in ports:
-            if not isinstance(p, port_type):
-                raise AssertionError("'ports' must be of type {} but "
-                                     "found {}.".format(cls_name, p.__class__))
-            if assert_same_type:
-                if not isinstance(p, specific_cls):
+            if not isinstance(p, port_type) or \
+                    (assert_same_type and type(p) is not specific_cls) or \
+                    (assert_same_shape and p.shape != shape):
+                # Only find out which check failed once one did
+                if not isinstance(p, port_type):
+                    raise AssertionError("'ports' must be of type {} but "
+                                         "found {}.".format(port_type.__name__,
+                                                            type(p)))
+                if assert_same_type and type(p) is not specific_cls:
                     raise AssertionError(
                         "All ports must be of same type but found {} "
-                        "and {}.".format(specific_cls, p.__class__)
+                        "and {}.".format(specific_cls, type(p))
                     )
-            if assert_same_shape:
-                if self.shape != p.shape:
-                    raise AssertionError("Shapes {} and {} "
-                                         "are incompatible."
-                                         .format(self.shape, p.shape))
+                raise AssertionError("Shapes {} and {} "
+                                     "are incompatible."
+                                     .format(shape, p.shape))
 
     def _add_inputs(self, inputs: ty.List["AbstractPort"]):
         """Adds new input connections to port. Does not allow that same
         inputs get connected more than once to port."""
-        if not is_disjoint(self.in_connections, inputs):
+        ids = [id(p) for p in inputs]
+        if not self._in_ids.isdisjoint(ids):
             raise pe.DuplicateConnectionError()
+        self._in_ids.update(ids)
         self.in_connections += inputs
+        AbstractPort._graph_version += 1
 
     def _add_outputs(self, outputs: ty.List["AbstractPort"]):
         """Adds new output connections to port. Does not allow that same
         outputs get connected more than once to port."""
-        if not is_disjoint(self.out_connections, outputs):
+        ids = [id(p) for p in outputs]
+        if not self._out_ids.isdisjoint(ids):
             raise pe.DuplicateConnectionError()
+        self._out_ids.update(ids)
         self.out_connections += outputs
+        AbstractPort._graph_version += 1
 
     def _connect_forward(
             self,
@@ -102,56 +130,75 @@ class AbstractPort(AbstractProcessMember):
         # Add other ports to this port's output connections
         self._add_outputs(ports)
         # Add this port to input connections of other ports
+        this = [self]
         for p in ports:
-            p._add_inputs([self])
+            p._add_inputs(this)
 
     def _connect_backward(
             self,
             ports: ty.List["AbstractPort"],
             port_type: ty.Type["AbstractPort"],
             assert_same_shape: bool = True,
-            assert_same_type: bool = True):
+            assert_same_type: bool = True,
+            validate: bool = True):
         """Creates a backward connection from other ports to this
         AbstractPort by adding other ports to this AbstractPort's
         in_connection and by adding this AbstractPort to other port's
-        out_connections."""
+        out_connections. Validation of 'ports' can be skipped if the caller
+        has already validated them."""
 
-        self._validate_ports(
-            ports, port_type, assert_same_shape, assert_same_type
-        )
+        if validate:
+            self._validate_ports(
+                ports, port_type, assert_same_shape, assert_same_type
+            )
         # Add other ports to this port's input connections
         self._add_inputs(ports)
         # Add this port to output connections of other ports
+        this = [self]
         for p in ports:
-            p._add_outputs([self])
+            p._add_outputs(this)
 
     def get_src_ports(self, _include_self=False) -> ty.List["AbstractPort"]:
         """Returns the list of all source ports that connect either directly
         or indirectly (through other ports) to this port."""
-        if len(self.in_connections) == 0:
-            if _include_self:
-                return [self]
-            else:
-                return []
-        else:
-            ports = []
-            for p in self.in_connections:
-                ports += p.get_src_ports(True)
-            return ports
+        version, include_self, ports = self._src_cache
+        if version != AbstractPort._graph_version or \
+                include_self != _include_self:
+            ports = self._traverse("in_connections", _include_self)
+            self._src_cache = (AbstractPort._graph_version, _include_self,
+                               ports)
+        return list(ports)
 
     def get_dst_ports(self, _include_self=False) -> ty.List["AbstractPort"]:
         """Returns the list of all destination ports that this port connects to
         either directly or indirectly (through other ports)."""
-        if len(self.out_connections) == 0:
-            if _include_self:
-                return [self]
+        version, include_self, ports = self._dst_cache
+        if version != AbstractPort._graph_version or \
+                include_self != _include_self:
+            ports = self._traverse("out_connections", _include_self)
+            self._dst_cache = (AbstractPort._graph_version, _include_self,
+                               ports)
+        return list(ports)
+
+    def _traverse(self, connections: str, include_self: bool) -> ty.Tuple:
+        """Returns the terminal ports reachable from this port by following
+        the given 'connections' attribute."""
+        conns = getattr(self, connections)
+        if not conns:
+            return (self,) if include_self else ()
+        ports = []
+        # Depth-first traversal with an explicit stack. Connections are
+        # pushed in reverse to visit them in the same order as a recursion.
+        # Only ports without further connections end up in the result.
+        stack = conns[::-1]
+        while stack:
+            port = stack.pop()
+            conns = getattr(port, connections)
+            if conns:
+                stack.extend(reversed(conns))
             else:
-                return []
-        else:
-            ports = []
-            for p in self.out_connections:
-                ports += p.get_dst_ports(True)
-            return ports
+                ports.append(port)
+        return tuple(ports)
 
     def reshape(self, new_shape: ty.Tuple) -> "ReshapePort":
         """Reshapes this port by deriving and returning a new virtual
@@ -193,22 +240,34 @@ class AbstractPort(AbstractProcessMember):
         :param ports: Port(s) that will be concatenated after this port.
         :param axis: Axis/dimension along which ports are concatenated.
         """
-        ports = [self] + to_list(ports)
+        ports = [self, *to_list(ports)]
         if isinstance(self, AbstractIOPort):
             port_type = AbstractIOPort
         else:
             port_type = AbstractRVPort
-        self._validate_ports(ports, port_type, assert_same_shape=False)
-        return ConcatPort(ports, axis)
+        self._validate_ports(
+            ports, port_type, assert_same_shape=False, assert_same_type=True
+        )
+        return ConcatPort(ports, axis, _pre_validated=True)
 
     def __repr__(self):
-        rep = super().__repr__()
-        in_conns = [f"{p.name}({p._process.name})" for p in self.in_connections]
-        out_conns = [f"{p.name}({p._process.name})" for p in self.out_connections]
         return (
-            rep
-            + f"\n    in_connections: {in_conns}"
-            + f"\n    out_connections: {out_conns}"
+            f"{self.__class__.__qualname__}(name={self.name!r}, "
+            f"shape={self.shape}, in={len(self.in_connections)}, "
+            f"out={len(self.out_connections)})"
+        )
+
+    def describe(self) -> str:
+        """Returns a detailed description of this port including the names
+        of all ports it is directly connected to."""
+        in_conns = ", ".join(
+            f"{p.name}({p._process.name})" for p in self.in_connections)
+        out_conns = ", ".join(
+            f"{p.name}({p._process.name})" for p in self.out_connections)
+        return (
+            f"{super().__repr__()}"
+            f"\n    in_connections: [{in_conns}]"
+            f"\n    out_connections: [{out_conns}]"
         )
 
 
@@ -350,15 +409,16 @@ class RefPort(AbstractRVPort, AbstractSrcPort):
         -----------
         :param ports: The AbstractRVPort(s) to connect to.
         """
-        for p in to_list(ports):
-            if not isinstance(p, RefPort) and not isinstance(p, VarPort):
+        ports = to_list(ports)
+        for p in ports:
+            if not isinstance(p, _RV_PORT_TYPES):
                 raise TypeError(
                     "RefPorts can only be connected to RefPorts or "
                     "VarPorts: {!r}: {!r} -> {!r}: {!r}  To connect a RefPort "
                     "to a Var, use <connect_var>".format(
                         self.process.__class__.__name__, self.name,
                         p.process.__class__.__name__, p.name))
-        self._connect_forward(to_list(ports), AbstractRVPort)
+        self._connect_forward(ports, AbstractRVPort)
 
     def connect_from(self, ports: ty.Union["RefPort", ty.List["RefPort"]]):
         """Connects other RefPort(s) of a nested process to this RefPort.
@@ -368,14 +428,15 @@ class RefPort(AbstractRVPort, AbstractSrcPort):
         ----------
         :param ports: The RefPort(s) that connect to this RefPort.
         """
-        for p in to_list(ports):
+        ports = to_list(ports)
+        for p in ports:
             if not isinstance(p, RefPort):
                 raise TypeError(
                     "RefPorts can only receive connections from RefPorts: "
                     "{!r}: {!r} -> {!r}: {!r}".format(
                         self.process.__class__.__name__, self.name,
                         p.process.__class__.__name__, p.name))
-        self._connect_backward(to_list(ports), RefPort)
+        self._connect_backward(ports, RefPort)
 
     def connect_var(self, variables: ty.Union[Var, ty.List[Var]]):
         """Connects this RefPort to Lava Process Var(s) to facilitate shared
@@ -387,46 +448,54 @@ class RefPort(AbstractRVPort, AbstractSrcPort):
         """
 
         variables: ty.List[Var] = to_list(variables)
-        # Check all 'variables' are actually Vars and don't have same parent
-        # process as RefPort
+        # Check all 'variables' are actually Vars, have the same shape and
+        # don't have same parent process as RefPort before creating any
+        # VarPorts
+        process = self.process
+        var_shape = variables[0].shape
+        vp_keys = set()
         for v in variables:
             if not isinstance(v, Var):
                 raise AssertionError(
                     "'variables' must be a Var or list of Vars but "
                     "found {}.".format(v.__class__)
                 )
-            if self.process is not None:
-                # Only assign when parent process is already assigned
-                if self.process == v.process:
-                    raise AssertionError("RefPort and Var have same "
-                                         "parent process.")
-        var_ports = []
-        var_shape = variables[0].shape
-        for v in variables:
-            # Check that shapes of all vars are the same
+            # Only check when parent process is already assigned
+            if process is not None and process == v.process:
+                raise AssertionError("RefPort and Var have same "
+                                     "parent process.")
             if var_shape != v.shape:
                 raise AssertionError("All 'vars' must have same shape.")
+            # VarPort name could shadow existing attribute or the VarPort of
+            # a Var given more than once
+            if v.process is not None:
+                vp_key = (id(v.process), "_" + v.name + "_implicit_port")
+                if vp_key in vp_keys or hasattr(v.process, vp_key[1]):
+                    raise AssertionError(
+                        "Name of implicit VarPort might conflict"
+                        " with existing attribute.")
+                vp_keys.add(vp_key)
+        var_ports = []
+        for v in variables:
             # Create a VarPort to wrap Var
             vp = ImplicitVarPort(v)
             # Propagate name and parent process of Var to VarPort
             vp.name = "_" + v.name + "_implicit_port"
-            if v.process is not None:
+            var_process = v.process
+            if var_process is not None:
                 # Only assign when parent process is already assigned
-                vp.process = v.process
-                # VarPort name could shadow existing attribute
-                if hasattr(v.process, vp.name):
-                    raise AssertionError(
-                        "Name of implicit VarPort might conflict"
-                        " with existing attribute.")
-                setattr(v.process, vp.name, vp)
-                v.process.var_ports.add_members({vp.name: vp})
+                vp.process = var_process
+                setattr(var_process, vp.name, vp)
+                var_process.var_ports.add_members({vp.name: vp})
             var_ports.append(vp)
         # Connect RefPort to VarPorts that wrap Vars
         self.connect(var_ports)
 
     def get_dst_vars(self) -> ty.List[Var]:
         """Returns destination Vars this RefPort is connected to."""
-        return [ty.cast(VarPort, p).var for p in self.get_dst_ports()]
+        # Destination ports of RefPorts are always VarPorts
+        dst_ports: ty.List[VarPort] = self.get_dst_ports()
+        return [p.var for p in dst_ports]
 
 
 class VarPort(AbstractRVPort, AbstractDstPort):
@@ -465,14 +534,15 @@ class VarPort(AbstractRVPort, AbstractDstPort):
         ----------
         :param ports: The VarPort(s) to connect to.
         """
-        for p in to_list(ports):
+        ports = to_list(ports)
+        for p in ports:
             if not isinstance(p, VarPort):
                 raise TypeError(
                     "VarPorts can only be connected to VarPorts: "
                     "{!r}: {!r} -> {!r}: {!r}".format(
                         self.process.__class__.__name__, self.name,
                         p.process.__class__.__name__, p.name))
-        self._connect_forward(to_list(ports), VarPort)
+        self._connect_forward(ports, VarPort)
 
     def connect_from(
             self, ports: ty.Union["AbstractRVPort", ty.List["AbstractRVPort"]]):
@@ -483,23 +553,42 @@ class VarPort(AbstractRVPort, AbstractDstPort):
         ----------
         :param ports: The AbstractRVPort(s) that connect to this VarPort.
         """
-        for p in to_list(ports):
-            if not isinstance(p, RefPort) and not isinstance(p, VarPort):
+        ports = to_list(ports)
+        for p in ports:
+            if not isinstance(p, _RV_PORT_TYPES):
                 raise TypeError(
                     "VarPorts can only receive connections from RefPorts or "
                     "VarPorts: {!r}: {!r} -> {!r}: {!r}".format(
                         self.process.__class__.__name__, self.name,
                         p.process.__class__.__name__, p.name))
-        self._connect_backward(to_list(ports), AbstractRVPort)
+        self._connect_backward(ports, AbstractRVPort)
 
-    def __repr__(self):
-        rep = super().__repr__()
+    def describe(self) -> str:
+        rep = super().describe()
         var = f"{self.var.name}({self.process.name})" if self.var else "N/A"
         return (
             rep
             + f"\n    var: {var}"
         )
 
+
+# Concrete port types RefPorts and VarPorts may connect to or from
+_RV_PORT_TYPES = (RefPort, VarPort)
+
+# Types of ports that virtual ports derived from a given parent port type may
+# connect to
+_VIRTUAL_PORT_ALLOWED_TYPES = {
+    # If OutPort, only allow other IO ports
+    OutPort: AbstractIOPort,
+    # If InPort, only allow other InPorts
+    InPort: InPort,
+    # If RefPort, only allow other Ref- or VarPorts
+    RefPort: AbstractRVPort,
+    # If VarPort, only allow other VarPorts
+    VarPort: VarPort,
+}
+
+
 class ImplicitVarPort(VarPort):
     """Sub class for VarPort to identify implicitly created VarPorts when
     a RefPort connects directly to a Var."""
@@ -524,9 +613,22 @@ class AbstractVirtualPort(ABC):
         derived from."""
         return self._parent_port.process
 
+    @ft.cached_property
+    def _allowed_port_type(self) -> ty.Type[AbstractPort]:
+        """Returns the type of ports this VirtualPort may connect to. The
+        parent port does not change once the VirtualPort is connected to it
+        so this only needs to be determined once."""
+        parent_port = self._parent_port
+        port_type = _VIRTUAL_PORT_ALLOWED_TYPES.get(type(parent_port))
+        if port_type is not None:
+            return port_type
+        # Fall back to subclasses of the parent port types
+        for parent_type, port_type in _VIRTUAL_PORT_ALLOWED_TYPES.items():
+            if isinstance(parent_port, parent_type):
+                return port_type
+        raise TypeError("Illegal parent port.")
+
 
-# ToDo: (AW) ReshapePort.connect(..) could be consolidated with
-#  ConcatPort.connect(..)
 class ReshapePort(AbstractPort, AbstractVirtualPort):
     """A ReshapePort is a virtual port that allows to change the shape of a
     port before connecting to another port.
@@ -548,23 +650,7 @@ class ReshapePort(AbstractPort, AbstractVirtualPort):
         :param ports: The port(s) to connect to. Connections from an IOPort
         to a RVPort and vice versa are not allowed.
         """
-        # Determine allows port_type
-        if isinstance(self._parent_port, OutPort):
-            # If OutPort, only allow other IO ports
-            port_type = AbstractIOPort
-        elif isinstance(self._parent_port, InPort):
-            # If InPort, only allow other InPorts
-            port_type = InPort
-        elif isinstance(self._parent_port, RefPort):
-            # If RefPort, only allow other Ref- or VarPorts
-            port_type = AbstractRVPort
-        elif isinstance(self._parent_port, VarPort):
-            # If VarPort, only allow other VarPorts
-            port_type = VarPort
-        else:
-            raise TypeError("Illegal parent port.")
-        # Connect to ports
-        self._connect_forward(to_list(ports), port_type)
+        self._connect_forward(to_list(ports), self._allowed_port_type)
 
 
 class ConcatPort(AbstractPort, AbstractVirtualPort):
@@ -575,35 +661,39 @@ class ConcatPort(AbstractPort, AbstractVirtualPort):
     It is used by the compiler to map the indices of the underlying
     tensor-valued data array from the derived to the new shape."""
 
-    def __init__(self, ports: ty.List[AbstractPort], axis: int):
+    def __init__(
+            self,
+            ports: ty.List[AbstractPort],
+            axis: int,
+            _pre_validated: bool = False):
         AbstractPort.__init__(self, self._get_new_shape(ports, axis))
         self._connect_backward(
-            ports, AbstractPort, assert_same_shape=False, assert_same_type=True
+            ports, AbstractPort, assert_same_shape=False, assert_same_type=True,
+            validate=not _pre_validated
         )
         self.concat_axis = axis
 
     @staticmethod
     def _get_new_shape(ports: ty.List[AbstractPort], axis):
         """Computes shape of ConcatPort from given 'ports'."""
-        # Extract shapes of given ports
-        concat_shapes = [p.shape for p in ports]
+        # Shape dimensions other than concatenation axis must match those of
+        # the first port
+        ref_shape = ports[0].shape
+        shape_ex_axis = ref_shape[:axis] + ref_shape[axis + 1:]
         total_size = 0
-        shapes_ex_axis = []
-        shapes_incompatible = False
-        for shape in concat_shapes:
+        for p in ports:
+            shape = p.shape
+            # Ports sharing the shape tuple of the first port are compatible
+            # without slicing their shape
+            if shape is not ref_shape and \
+                    shape[:axis] + shape[axis + 1:] != shape_ex_axis:
+                raise pe.ConcatShapeError(
+                    [shape_ex_axis, shape[:axis] + shape[axis + 1:]], axis)
             # Compute total size along concatenation axis
             total_size += shape[axis]
-            # Extract shape dimensions other than concatenation axis
-            shapes_ex_axis.append(shape[:axis] + shape[axis + 1:])
-            if len(shapes_ex_axis) > 1:
-                shapes_incompatible = shapes_ex_axis[-2] != shapes_ex_axis[-1]
-
-        if shapes_incompatible:
-            raise pe.ConcatShapeError(shapes_ex_axis, axis)
 
         # Return shape of concatenated port
-        new_shape = shapes_ex_axis[0]
-        return new_shape[:axis] + (total_size,) + new_shape[axis:]
+        return shape_ex_axis[:axis] + (total_size,) + shape_ex_axis[axis:]
 
     @property
     def _parent_port(self) -> AbstractPort:
@@ -617,23 +707,7 @@ class ConcatPort(AbstractPort, AbstractVirtualPort):
         :param ports: The port(s) to connect to. Connections from an IOPort
         to a RVPort and vice versa are not allowed.
         """
-        # Determine allows port_type
-        if isinstance(self._parent_port, OutPort):
-            # If OutPort, only allow other IO ports
-            port_type = AbstractIOPort
-        elif isinstance(self._parent_port, InPort):
-            # If InPort, only allow other InPorts
-            port_type = InPort
-        elif isinstance(self._parent_port, RefPort):
-            # If RefPort, only allow other Ref- or VarPorts
-            port_type = AbstractRVPort
-        elif isinstance(self._parent_port, VarPort):
-            # If VarPort, only allow other VarPorts
-            port_type = VarPort
-        else:
-            raise TypeError("Illegal parent port.")
-        # Connect to ports
-        self._connect_forward(to_list(ports), port_type)
+        self._connect_forward(to_list(ports), self._allowed_port_type)
 
 
 # ToDo: (AW) TBD...
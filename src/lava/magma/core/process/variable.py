@@ -1,7 +1,10 @@
 # Copyright (C) 2021 Intel Corporation
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
+import threading
 import typing as ty
+import weakref
+
 import numpy as np
 
 from lava.magma.core.process.interfaces import \
@@ -107,29 +110,41 @@ class Var(AbstractProcessMember):
                     f"'{self.process.name}::{self.process.__class__.__name__}'"
                     f".")
 
+    def _resolve_alias(self) -> 'Var':
+        """Returns the Var at the end of the alias chain of this Var."""
+        var = self
+        while var.aliased_var is not None:
+            var = var.aliased_var
+        return var
+
     def set(self, value: np.ndarray, idx: np.ndarray = None):
         """Sets value of Var. If this Var aliases another Var, then set(..) is
         delegated to aliased Var."""
-        if self.aliased_var is not None:
-            self.aliased_var.set(value, idx)
+        var = self._resolve_alias()
+        if var.process.runtime:
+            var.process.runtime.set_var(var.id, value, idx)
         else:
-            if self.process.runtime:
-                self.process.runtime.set_var(self.id, value, idx)
-            else:
-                raise ValueError(
-                    "No Runtime available yet. Cannot set new 'Var' without "
-                    "Runtime.")
+            raise ValueError(
+                "No Runtime available yet. Cannot set new 'Var' without "
+                "Runtime.")
 
     def get(self, idx: np.ndarray = None) -> np.ndarray:
         """Gets and returns value of Var. If this Var aliases another Var,
         then get() is delegated to aliased Var."""
-        if self.aliased_var is not None:
-            return self.aliased_var.get(idx)
+        var = self._resolve_alias()
+        if var.process.runtime:
+            return var.process.runtime.get_var(var.id, idx)
         else:
-            if self.process.runtime:
-                return self.process.runtime.get_var(self.id, idx)
-            else:
-                return self.init
+            return var._get_init_ndarray()
+
+    def _get_init_ndarray(self) -> np.ndarray:
+        """Returns a writable copy of the initial value broadcast to the shape
+        of the Var, like get() does with a Runtime. An initial value that
+        does not broadcast to the shape is returned as it is."""
+        try:
+            return np.array(np.broadcast_to(np.asarray(self.init), self.shape))
+        except ValueError:
+            return self.init
 
     def __repr__(self) -> str:
         rep = super().__repr__()
@@ -145,33 +160,42 @@ class VarServer(IdGeneratorSingleton):
     new globally unique Var ids."""
 
     instance: ty.Optional["VarServer"] = None
-    is_not_initialized: bool = True
+    _lock = threading.Lock()
 
     def __new__(cls):
+        # Double-checked locking so that concurrent first calls create and
+        # initialize exactly one instance
         if VarServer.instance is None:
-            VarServer.instance = object.__new__(VarServer)
+            with VarServer._lock:
+                if VarServer.instance is None:
+                    inst = object.__new__(VarServer)
+                    inst._next_id = 0
+                    # Only weakly referenced so that the VarServer does not
+                    # keep Vars that are no longer used alive
+                    inst.vars: ty.MutableMapping[int, Var] = \
+                        weakref.WeakValueDictionary()
+                    VarServer.instance = inst
         return VarServer.instance
 
     def __init__(self):
-        if VarServer.is_not_initialized:
-            super().__init__()
-            self.vars: ty.List[Var] = []
-            VarServer.is_not_initialized = False
+        # The state of the singleton is initialized once in __new__
+        pass
 
     @property
     def num_vars(self):
         """Returns number of vars created so far."""
-        return len(self.vars)
+        return self._next_id
 
     def register(self, var: Var) -> int:
         """Registers a Var with VarServer."""
         if not isinstance(var, Var):
             raise AssertionError("'var' must be a Var.")
-        self.vars.append(var)
-        return self.get_next_id()
+        var_id = self.get_next_id()
+        self.vars[var_id] = var
+        return var_id
 
     def reset_server(self):
         """Resets the VarServer to initial state."""
-        self.vars = []
+        self.vars = weakref.WeakValueDictionary()
         self._next_id = 0
         VarServer.reset_singleton()
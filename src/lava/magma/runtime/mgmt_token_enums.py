@@ -1,10 +1,12 @@
 # Copyright (C) 2021 Intel Corporation
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
+import functools as ft
 import numpy as np
 import typing as ty
 
 
+@ft.lru_cache(maxsize=4096)
 def enum_to_np(value: ty.Union[int, float],
                d_type: type = np.int32) -> np.array:
     """
@@ -12,12 +14,17 @@ def enum_to_np(value: ty.Union[int, float],
     np array so as to pass it via the message passing framework. The dtype of
     the np array is specified by d_type with the default of np.int32.
 
+    The same values are converted over and over again, so the arrays are
+    cached and returned read-only.
+
     :param value: value to be converted to a 1-D array
     :param d_type: type of the converted np array
     :return: np array with the value
     """
 
-    return np.array([value], dtype=d_type)
+    arr = np.array([value], dtype=d_type)
+    arr.flags.writeable = False
+    return arr
 
 
 class MGMT_COMMAND:
@@ -34,25 +41,35 @@ class MGMT_COMMAND:
     """Signifies a STOP command from one actor to another"""
     PAUSE = enum_to_np(-2)
     """Signifies a PAUSE command from one actor to another"""
+    RUN_CONTINUOUS = enum_to_np(-3)
+    """Signifies a RUN command without a limit on the number of time steps
+    from one actor to another"""
 
 
 class REQ_TYPE:
     """
-    Signifies type of request
+    Signifies type of request. The *_INT values are used in the single
+    [REQ_TYPE, model_id, var_id] header the Runtime sends per request.
     """
     GET = enum_to_np(0)
     """Read a variable"""
     SET = enum_to_np(1)
     """Write to a variable"""
+    GET_INT = 0
+    SET_INT = 1
 
 
 class MGMT_RESPONSE:
     """Signifies the response to a Mgmt command. This response can be sent
-    by any actor upon receiving a Mgmt command"""
+    by any actor upon receiving a Mgmt command. The *_INT values allow to
+    check a received response with a plain int comparison."""
 
-    DONE = enum_to_np(0)
+    DONE_INT = 0
+    DONE = enum_to_np(DONE_INT)
     """Signfies Ack or Finished with the Command"""
-    TERMINATED = enum_to_np(-1)
+    TERMINATED_INT = -1
+    TERMINATED = enum_to_np(TERMINATED_INT)
     """Signifies Termination"""
-    PAUSED = enum_to_np(-2)
+    PAUSED_INT = -2
+    PAUSED = enum_to_np(PAUSED_INT)
     """Signifies Execution State to be Paused"""
@@ -3,11 +3,14 @@
 # See: https://spdx.org/licenses/
 from __future__ import annotations
 
+import functools as ft
 import typing as ty
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 
-from lava.magma.compiler.channels.pypychannel import CspSendPort, CspRecvPort
+from lava.magma.compiler.channels.pypychannel import CspSendPort, \
+    CspRecvPort, start_csp_ports
 from lava.magma.compiler.exec_var import AbstractExecVar
 from lava.magma.core.process.message_interface_enum import ActorType
 from lava.magma.runtime.message_infrastructure.message_infrastructure_interface\
@@ -16,14 +19,13 @@ from lava.magma.runtime.message_infrastructure.factory import \
     MessageInfrastructureFactory
 from lava.magma.runtime.mgmt_token_enums import MGMT_COMMAND, MGMT_RESPONSE, \
     enum_to_np, REQ_TYPE
-from lava.magma.runtime.runtime_service import AsyncPyRuntimeService
 
 if ty.TYPE_CHECKING:
     from lava.magma.core.process.process import AbstractProcess
 from lava.magma.compiler.builder import AbstractProcessBuilder, \
-    RuntimeChannelBuilderMp, ServiceChannelBuilderMp, \
+    PyProcessBuilder, RuntimeChannelBuilderMp, ServiceChannelBuilderMp, \
     RuntimeServiceBuilder
-from lava.magma.compiler.channels.interfaces import Channel
+from lava.magma.compiler.channels.interfaces import Channel, ChannelRole
 from lava.magma.core.resources import HeadNode
 from lava.magma.core.run_conditions import RunSteps, RunContinuous
 from lava.magma.compiler.executable import Executable
@@ -63,6 +65,27 @@ class Runtime:
         self.runtime_to_service_req: ty.Iterable[CspSendPort] = []
         self.service_to_runtime_data: ty.Iterable[CspRecvPort] = []
         self.runtime_to_service_data: ty.Iterable[CspSendPort] = []
+        # Maps the role of a sync channel to the list its runtime end
+        # belongs to
+        self._sync_channel_ports: ty.Dict[ChannelRole, ty.List] = {
+            ChannelRole.CMD: self.runtime_to_service_cmd,
+            ChannelRole.ACK: self.service_to_runtime_ack,
+            ChannelRole.REQ: self.runtime_to_service_req,
+            ChannelRole.DATA_IN: self.service_to_runtime_data,
+            ChannelRole.DATA_OUT: self.runtime_to_service_data,
+        }
+        # Runtime ends of all sync channels in the order of the lists above
+        self._all_ports: ty.List = []
+        # Bound send/recv methods of the cmd and ack ports
+        self._cmd_sends: ty.List[ty.Callable[[np.ndarray], None]] = []
+        self._ack_recvs: ty.List[ty.Callable[[], np.ndarray]] = []
+        # ExecVars of the one and only NodeConfig by Var id, set on
+        # initialize
+        self._exec_vars: ty.Dict[int, AbstractExecVar] = {}
+        # Shared memory and float64 view of it per Var id. The view is listed
+        # last so it gets released before the shared memory is closed.
+        self._var_buffers: ty.Dict[
+            int, ty.Tuple[SharedMemory, np.ndarray]] = {}
 
     def __del__(self):
         """On destruction, terminate Runtime automatically to
@@ -86,26 +109,21 @@ class Runtime:
             raise AssertionError
         if node_config[0].node_type != HeadNode:
             raise AssertionError
+        self._exec_vars = node_config.exec_vars
 
         self._build_message_infrastructure()
         self._build_channels()
         self._build_sync_channels()
+        self._build_var_buffers()
         self._build_processes()
         self._build_runtime_services()
         self._start_ports()
         self._is_initialized = True
 
     def _start_ports(self):
-        for port in self.runtime_to_service_cmd:
-            port.start()
-        for port in self.service_to_runtime_ack:
-            port.start()
-        for port in self.runtime_to_service_req:
-            port.start()
-        for port in self.service_to_runtime_data:
-            port.start()
-        for port in self.runtime_to_service_data:
-            port.start()
+        # Serve all ports from one listener thread rather than starting a
+        # thread per port
+        start_csp_ports(self._all_ports)
 
     # ToDo: (AW) Hack: This currently just returns the one and only NodeCfg
     @property
@@ -118,14 +136,20 @@ class Runtime:
             self._messaging_infrastructure_type)
         self._messaging_infrastructure.start()
 
-    def _get_process_builder_for_process(self, process):
+    @ft.cached_property
+    def _process_builders(self) -> ty.Dict[
+            "AbstractProcess", "AbstractProcessBuilder"]:
+        """Returns the builders of all processes of the executable."""
         process_builders: ty.Dict[
             "AbstractProcess", "AbstractProcessBuilder"
         ] = {}
         process_builders.update(self._executable.c_builders)
         process_builders.update(self._executable.py_builders)
         process_builders.update(self._executable.nc_builders)
-        return process_builders[process]
+        return process_builders
+
+    def _get_process_builder_for_process(self, process):
+        return self._process_builders[process]
 
     def _build_channels(self):
         if self._executable.channel_builders:
@@ -140,6 +164,30 @@ class Runtime:
                     channel_builder.dst_process).set_csp_ports(
                     [channel.dst_port])
 
+    def _build_var_buffers(self):
+        """Allocates a shared memory buffer for each Var of a PyProcessModel
+        through which Var.get() and Var.set(..) exchange data with the
+        ProcessModel instead of sending it item by item. Like the buffers of
+        the channels, they are allocated through the SharedMemoryManager of
+        the messaging infrastructure, which unlinks them when it stops."""
+        smm = self._messaging_infrastructure.smm
+        var_buffers: ty.Dict[
+            PyProcessBuilder, ty.Dict[int, ty.Tuple[SharedMemory, int]]] = {}
+        for var_id, ev in self._exec_vars.items():
+            builder = self._get_process_builder_for_process(ev.process)
+            if not isinstance(builder, PyProcessBuilder):
+                continue
+            num_items = max(ev.var.size, 1)
+            shm = smm.SharedMemory(
+                size=num_items * np.dtype(np.float64).itemsize)
+            # The segment may be larger than requested, so size the view
+            # after the Var
+            self._var_buffers[var_id] = (
+                shm, np.ndarray((num_items,), np.float64, buffer=shm.buf))
+            var_buffers.setdefault(builder, {})[var_id] = (shm, num_items)
+        for builder, buffers in var_buffers.items():
+            builder.set_var_buffers(buffers)
+
     def _build_sync_channels(self):
         if self._executable.sync_channel_builders:
             for sync_channel_builder in self._executable.sync_channel_builders:
@@ -151,20 +199,15 @@ class Runtime:
                                   RuntimeServiceBuilder):
                         sync_channel_builder.src_process.set_csp_ports(
                             [channel.src_port])
+                        runtime_port = channel.dst_port
                     else:
                         sync_channel_builder.dst_process.set_csp_ports(
                             [channel.dst_port])
-                    # TODO: Get rid of if/else ladder
-                    if "runtime_to_service_cmd" in channel.src_port.name:
-                        self.runtime_to_service_cmd.append(channel.src_port)
-                    elif "service_to_runtime_ack" in channel.src_port.name:
-                        self.service_to_runtime_ack.append(channel.dst_port)
-                    elif "runtime_to_service_req" in channel.src_port.name:
-                        self.runtime_to_service_req.append(channel.src_port)
-                    elif "service_to_runtime_data" in channel.src_port.name:
-                        self.service_to_runtime_data.append(channel.dst_port)
-                    elif "runtime_to_service_data" in channel.src_port.name:
-                        self.runtime_to_service_data.append(channel.src_port)
+                        runtime_port = channel.src_port
+                    ports = self._sync_channel_ports.get(
+                        sync_channel_builder.role)
+                    if ports is not None:
+                        ports.append(runtime_port)
                 elif isinstance(sync_channel_builder, ServiceChannelBuilderMp):
                     if isinstance(sync_channel_builder.src_process,
                                   RuntimeServiceBuilder):
@@ -181,6 +224,23 @@ class Runtime:
                             [channel.src_port])
                 else:
                     raise ValueError("Unexpected type of Sync Channel Builder")
+        self._all_ports = [port for ports in self._sync_channel_ports.values()
+                           for port in ports]
+        self._cmd_sends = [port.send for port in self.runtime_to_service_cmd]
+        self._ack_recvs = [port.recv for port in self.service_to_runtime_ack]
+
+    def _send_cmd(self, cmd: np.ndarray):
+        """Sends a command to all RuntimeServices."""
+        for send in self._cmd_sends:
+            send(cmd)
+
+    def _recv_acks(self, expected: int):
+        """Receives the response of every RuntimeService and raises if it is
+        not the 'expected' MGMT_RESPONSE."""
+        for recv in self._ack_recvs:
+            data = recv()
+            if int(data[0]) != expected:
+                raise RuntimeError(f"Runtime Received {data}")
 
     # ToDo: (AW) Why not pass the builder as an argument to the mp.Process
     #  constructor which will then be passed to the target function?
@@ -222,22 +282,16 @@ class Runtime:
             self._is_running = True
             if isinstance(run_condition, RunSteps):
                 self.num_steps = run_condition.num_steps
-                for send_port in self.runtime_to_service_cmd:
-                    send_port.send(enum_to_np(self.num_steps))
-                if run_condition.blocking:
-                    for recv_port in self.service_to_runtime_ack:
-                        data = recv_port.recv()
-                        if not np.array_equal(data, MGMT_RESPONSE.DONE):
-                            raise RuntimeError(f"Runtime Received {data}")
-                # ToDo: (AW) Why repeat?
+                self._send_cmd(enum_to_np(self.num_steps))
                 if run_condition.blocking:
+                    self._recv_acks(MGMT_RESPONSE.DONE_INT)
                     # FixMe: The Runtime must not be aware of time steps
                     #  because not every ProcessModel or RunCondition will
                     #  have a notion of discrete time steps
                     self.current_ts += self.num_steps
                     self._is_running = False
             elif isinstance(run_condition, RunContinuous):
-                pass
+                self._send_cmd(MGMT_COMMAND.RUN_CONTINUOUS)
             else:
                 raise ValueError(f"Wrong type of run_condition : "
                                  f"{run_condition.__class__}")
@@ -246,33 +300,22 @@ class Runtime:
 
     def wait(self):
         if self._is_running:
-            for recv_port in self.service_to_runtime_ack:
-                data = recv_port.recv()
-                if not np.array_equal(data, MGMT_RESPONSE.DONE):
-                    raise RuntimeError(f"Runtime Received {data}")
+            self._recv_acks(MGMT_RESPONSE.DONE_INT)
             self.current_ts += self.num_steps
             self._is_running = False
 
     def pause(self):
         if self._is_running:
-            for send_port in self.runtime_to_service_cmd:
-                send_port.send(MGMT_COMMAND.PAUSE)
-            for recv_port in self.service_to_runtime_ack:
-                data = recv_port.recv()
-                if not np.array_equal(data, MGMT_RESPONSE.PAUSED):
-                    raise RuntimeError(f"Runtime Received {data}")
+            self._send_cmd(MGMT_COMMAND.PAUSE)
+            self._recv_acks(MGMT_RESPONSE.PAUSED_INT)
             self._is_running = False
 
     def stop(self):
         """Stops an ongoing or paused run."""
         try:
             if self._is_started:
-                for send_port in self.runtime_to_service_cmd:
-                    send_port.send(MGMT_COMMAND.STOP)
-                for recv_port in self.service_to_runtime_ack:
-                    data = recv_port.recv()
-                    if not np.array_equal(data, MGMT_RESPONSE.TERMINATED):
-                        raise RuntimeError(f"Runtime Received {data}")
+                self._send_cmd(MGMT_COMMAND.STOP)
+                self._recv_acks(MGMT_RESPONSE.TERMINATED_INT)
                 self.join()
                 self._is_running = False
                 self._is_started = False
@@ -280,19 +323,31 @@ class Runtime:
             else:
                 print("Runtime not started yet.")
         finally:
+            self._release_var_buffers()
             self._messaging_infrastructure.stop()
 
+    def _release_var_buffers(self):
+        """Closes the shared memory buffers of all Vars. They are unlinked
+        once the messaging infrastructure stops. The views into the buffers
+        are released first because shared memory cannot be closed while
+        views into it exist."""
+        shms = [shm for shm, _ in self._var_buffers.values()]
+        self._var_buffers = {}
+        for shm in shms:
+            shm.close()
+
+    def _get_var_buffer(self, ev: AbstractExecVar) -> np.ndarray:
+        """Returns the view into the shared buffer of the Var 'ev'."""
+        try:
+            return self._var_buffers[ev.var_id][1]
+        except KeyError:
+            raise RuntimeError(
+                f"Var '{ev.name}' has no shared buffer. Only Vars of "
+                f"PyProcessModels can be get or set.") from None
+
     def join(self):
         """Join all ports and processes"""
-        for port in self.runtime_to_service_cmd:
-            port.join()
-        for port in self.service_to_runtime_ack:
-            port.join()
-        for port in self.runtime_to_service_req:
-            port.join()
-        for port in self.service_to_runtime_data:
-            port.join()
-        for port in self.runtime_to_service_data:
+        for port in self._all_ports:
             port.join()
 
     @property
@@ -306,38 +361,42 @@ class Runtime:
         assert not self._is_running, \
             "Setting Vars while running is currently not supported."
 
-        node_config: NodeConfig = self._executable.node_configs[0]
-        ev: AbstractExecVar = node_config.exec_vars[var_id]
+        ev: AbstractExecVar = self._exec_vars[var_id]
         runtime_srv_id: int = ev.runtime_srv_id
         model_id: int = ev.process.id
 
-        #if issubclass(list(self._executable.rs_builders.values())
-        #              [runtime_srv_id].rs_class, AsyncPyRuntimeService):
-        #    raise RuntimeError("Set is not supported in AsyncPyRuntimeService")
+        buffer: np.ndarray = value
+        if idx is not None:
+            buffer = buffer[idx]
+        num_items: int = buffer.size
+        var_buffer = self._get_var_buffer(ev)
+        if num_items > var_buffer.size:
+            raise ValueError(
+                f"Cannot set {num_items} values on Var '{ev.name}' of shape "
+                f"{ev.shape} with only {var_buffer.size} values.")
 
         # Send a msg to runtime service given the rs_id that you need value
         # from a model with model_id and var with var_id
 
         # 1. Send SET Command
         req_port: CspSendPort = self.runtime_to_service_req[runtime_srv_id]
-        req_port.send(REQ_TYPE.SET)
-        req_port.send(enum_to_np(model_id))
-        req_port.send(enum_to_np(var_id))
-
-        # 2. Reshape the data
-        buffer: np.ndarray = value
-        if idx:
-            buffer = buffer[idx]
-        buffer_shape: ty.Tuple[int, ...] = buffer.shape
-        num_items: int = np.prod(buffer_shape).item()
-        buffer = buffer.reshape((1, num_items))
+        req_port.send(np.array([REQ_TYPE.SET_INT, model_id, var_id],
+                               dtype=np.float64))
+
+        # 2. Write the data to the shared buffer of the Var. Copying into a
+        # view of the buffer with the shape of the data flattens it without
+        # an intermediate copy for non-contiguous data.
+        if num_items == 1:
+            # Scalar Vars are common and need no reshaped view
+            var_buffer[0] = buffer.flat[0]
+        else:
+            np.copyto(var_buffer[:num_items].reshape(buffer.shape), buffer,
+                      casting='unsafe')
 
-        # 3. Send [NUM_ITEMS, DATA1, DATA2, ...]
+        # 3. Send NUM_ITEMS, the ProcessModel reads the data from the buffer
         data_port: CspSendPort = self.runtime_to_service_data[
             runtime_srv_id]
         data_port.send(enum_to_np(num_items))
-        for i in range(num_items):
-            data_port.send(enum_to_np(buffer[0, i], np.float64))
 
     def get_var(self, var_id: int, idx: np.ndarray = None) -> np.ndarray:
         """Gets value of a variable with id 'var_id'."""
@@ -346,38 +405,32 @@ class Runtime:
         assert not self._is_running, \
             "Getting Vars while running is currently not supported."
 
-        node_config: NodeConfig = self._executable.node_configs[0]
-        ev: AbstractExecVar = node_config.exec_vars[var_id]
+        ev: AbstractExecVar = self._exec_vars[var_id]
         runtime_srv_id: int = ev.runtime_srv_id
         model_id: int = ev.process.id
-
-        # ToDo: (AW) Eliminate dead code if truly not needed anymore
-        #rs_builders = list(self._executable.rs_builders.values())
-        #rs_class = [rs for rs in rs_builders
-        #            if rs.runtime_service_id == runtime_srv_id][0].rs_class
-        #if issubclass(rs_class, AsyncPyRuntimeService):
-        #    raise RuntimeError("Get is not supported in AsyncPyRuntimeService")
+        var_buffer = self._get_var_buffer(ev)
 
         # Send a msg to runtime service given the rs_id that you need value
         # from a model with model_id and var with var_id
 
         # 1. Send GET Command
         req_port: CspSendPort = self.runtime_to_service_req[runtime_srv_id]
-        req_port.send(REQ_TYPE.GET)
-        req_port.send(enum_to_np(model_id))
-        req_port.send(enum_to_np(var_id))
+        req_port.send(np.array([REQ_TYPE.GET_INT, model_id, var_id],
+                               dtype=np.float64))
 
-        # 2. Receive Data [NUM_ITEMS, DATA1, DATA2, ...]
+        # 2. Receive NUM_ITEMS once the ProcessModel has written the data to
+        # the shared buffer of the Var
         data_port: CspRecvPort = self.service_to_runtime_data[
             runtime_srv_id]
-        num_items: int = int(data_port.recv()[0].item())
-        buffer: np.ndarray = np.empty((1, num_items))
-        for i in range(num_items):
-            buffer[0, i] = data_port.recv()[0]
-
-        # 3. Reshape result and return
-        buffer = buffer.reshape(ev.shape)
-        if idx:
-            return buffer[idx]
-        else:
-            return buffer
+        num_items: int = int(data_port.recv()[0])
+        if num_items < 0:
+            raise RuntimeError(
+                f"The ProcessModel holds {-num_items} values for Var "
+                f"'{ev.name}' of shape {ev.shape}, which do not fit into its "
+                f"buffer of {var_buffer.size} values.")
+
+        # 3. Index a view of the buffer and copy out only the result
+        buffer: np.ndarray = var_buffer[:num_items].reshape(ev.shape)
+        if idx is not None:
+            buffer = buffer[idx]
+        return buffer.copy()
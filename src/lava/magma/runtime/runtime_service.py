@@ -6,7 +6,8 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
-from lava.magma.compiler.channels.pypychannel import CspRecvPort, CspSendPort
+from lava.magma.compiler.channels.pypychannel import CspRecvPort, \
+    CspSendPort, CspSelector, start_csp_ports
 from lava.magma.core.sync.protocol import AbstractSyncProtocol
 from lava.magma.runtime.mgmt_token_enums import (
     MGMT_RESPONSE,
@@ -33,6 +34,7 @@ class AbstractRuntimeService(ABC):
         self.service_to_process_req: ty.Iterable[CspSendPort] = []
         self.process_to_service_data: ty.Iterable[CspRecvPort] = []
         self.service_to_process_data: ty.Iterable[CspSendPort] = []
+        self._selector: CspSelector = CspSelector()
 
     def __repr__(self):
         return f"Synchronizer : {self.__class__}, \
@@ -40,17 +42,17 @@ class AbstractRuntimeService(ABC):
                  Protocol: {self.protocol}"
 
     def start(self):
-        self.runtime_to_service_cmd.start()
-        self.service_to_runtime_ack.start()
-        self.runtime_to_service_req.start()
-        self.service_to_runtime_data.start()
-        self.runtime_to_service_data.start()
-        for i in range(len(self.service_to_process_cmd)):
-            self.service_to_process_cmd[i].start()
-            self.process_to_service_ack[i].start()
-            self.service_to_process_req[i].start()
-            self.process_to_service_data[i].start()
-            self.service_to_process_data[i].start()
+        # Start all channels with a single listener thread
+        start_csp_ports([self.runtime_to_service_cmd,
+                         self.service_to_runtime_ack,
+                         self.runtime_to_service_req,
+                         self.service_to_runtime_data,
+                         self.runtime_to_service_data,
+                         *self.service_to_process_cmd,
+                         *self.process_to_service_ack,
+                         *self.service_to_process_req,
+                         *self.process_to_service_data,
+                         *self.service_to_process_data])
         self.run()
 
     @abstractmethod
@@ -123,43 +125,31 @@ class LoihiPyRuntimeService(PyRuntimeService):
             req_port.send(request)
 
     def _get_pm_resp(self) -> ty.Iterable[MGMT_RESPONSE]:
-        """Retrieves responses of all ProcessModels."""
-        rcv_msgs = []
-        num_responses_expected = len(self.model_ids)
-        counter = 0
-        while counter < num_responses_expected:
-            ptos_recv_port = self.process_to_service_ack[counter]
-            if ptos_recv_port.probe():
-                rcv_msgs.append(ptos_recv_port.recv())
-                counter += 1
-        return rcv_msgs
+        """Retrieves responses of all ProcessModels. The responses of all
+        ProcessModels are needed before the next phase can start, so block on
+        each ack port in turn instead of spinning on probe()."""
+        return [ptos_recv_port.recv()
+                for ptos_recv_port in self.process_to_service_ack]
 
     def _relay_to_runtime_data_given_model_id(self, model_id: int):
         """Relays data received from ProcessModel given by model id  to the
-        runtime"""
+        runtime. The Var data itself is exchanged through a shared buffer so
+        only the number of items is relayed."""
         process_idx = self.model_ids.index(model_id)
 
         data_recv_port = self.process_to_service_data[process_idx]
         data_relay_port = self.service_to_runtime_data
-        num_items = data_recv_port.recv()
-        data_relay_port.send(num_items)
-        for i in range(int(num_items[0])):
-            value = data_recv_port.recv()
-            data_relay_port.send(value)
+        data_relay_port.send(data_recv_port.recv())
 
     def _relay_to_pm_data_given_model_id(self, model_id: int):
         """Relays data received from the runtime to the ProcessModel given by
-        the model id."""
+        the model id. The Var data itself is exchanged through a shared
+        buffer so only the number of items is relayed."""
         process_idx = self.model_ids.index(model_id)
 
         data_recv_port = self.runtime_to_service_data
         data_relay_port = self.service_to_process_data[process_idx]
-        # Receive and relay number of items
-        num_items = data_recv_port.recv()
-        data_relay_port.send(num_items)
-        # Receive and relay data1, data2, ...
-        for i in range(int(num_items[0].item())):
-            data_relay_port.send(data_recv_port.recv())
+        data_relay_port.send(data_recv_port.recv())
 
     def _relay_pm_ack_given_model_id(self, model_id: int):
         """Relays ack received from ProcessModel given by model id to the
@@ -170,46 +160,39 @@ class LoihiPyRuntimeService(PyRuntimeService):
         ack_relay_port = self.service_to_runtime_ack
         ack_relay_port.send(ack_recv_port.recv())
 
-    # ToDo: (AW) To be cleaned up
     def _handle_get_set(self, phase):
-        #if np.array_equal(phase, LoihiPyRuntimeService.Phase.HOST):
+        """Serves get/set Var requests from the runtime until the next command
+        arrives. Waits on both channels instead of probing them in a loop."""
+        select = self._selector.select
+        recv_req = self.runtime_to_service_req.recv
+        req_action = (self.runtime_to_service_req, lambda: 'req')
+        cmd_action = (self.runtime_to_service_cmd, lambda: 'cmd')
         while True:
-            if self.runtime_to_service_req.probe():
-                request = self.runtime_to_service_req.recv()
-                if np.array_equal(request, REQ_TYPE.GET):
-                    requests: ty.List[np.ndarray] = [request]
-                    # recv model_id
-                    model_id: int = \
-                        self.runtime_to_service_req.recv()[
-                            0].item()
-                    # recv var_id
-                    requests.append(
-                        self.runtime_to_service_req.recv())
-                    self._send_pm_req_given_model_id(model_id,
-                                                     *requests)
-
-                    self._relay_to_runtime_data_given_model_id(
-                        model_id)
-                elif np.array_equal(request, REQ_TYPE.SET):
-                    requests: ty.List[np.ndarray] = [request]
-                    # recv model_id
-                    model_id: int = \
-                        self.runtime_to_service_req.recv()[
-                            0].item()
-                    # recv var_id
-                    requests.append(
-                        self.runtime_to_service_req.recv())
-                    self._send_pm_req_given_model_id(model_id,
-                                                     *requests)
-
-                    self._relay_to_pm_data_given_model_id(
-                        model_id)
-                else:
-                    raise RuntimeError(
-                        f"Unknown request {request}")
-
-            if self.runtime_to_service_cmd.probe():
+            # Pending requests are served before the next command
+            if select(req_action, cmd_action) == 'cmd':
                 return
+            # The request arrives as one [REQ_TYPE, model_id, var_id] header
+            header = recv_req()
+            request = int(header[0])
+            model_id = int(header[1])
+            var_id = header[2:3]
+            if request == REQ_TYPE.GET_INT:
+                self._send_pm_req_given_model_id(model_id,
+                                                 REQ_TYPE.GET,
+                                                 var_id)
+
+                self._relay_to_runtime_data_given_model_id(
+                    model_id)
+            elif request == REQ_TYPE.SET_INT:
+                self._send_pm_req_given_model_id(model_id,
+                                                 REQ_TYPE.SET,
+                                                 var_id)
+
+                self._relay_to_pm_data_given_model_id(
+                    model_id)
+            else:
+                raise RuntimeError(
+                    f"Unknown request {header}")
 
     def run(self):
         """Retrieves commands from the runtime. On STOP or PAUSE commands all
@@ -219,64 +202,69 @@ class LoihiPyRuntimeService(PyRuntimeService):
         last time step is reached. The runtime is informed after the last time
         step. The loop ends when receiving the STOP command from the runtime."""
         phase = LoihiPyRuntimeService.Phase.HOST
+        recv_cmd = self.runtime_to_service_cmd.recv
         while True:
-            # Probe if there is a new command from the runtime
-            if self.runtime_to_service_cmd.probe():
-                command = self.runtime_to_service_cmd.recv()
-                if np.array_equal(command, MGMT_COMMAND.STOP):
-                    # Inform all ProcessModels about the STOP command
-                    self._send_pm_cmd(command)
-                    rsps = self._get_pm_resp()
-                    for rsp in rsps:
-                        if not np.array_equal(rsp, MGMT_RESPONSE.TERMINATED):
-                            raise ValueError(f"Wrong Response Received : {rsp}")
-                    # Inform the runtime about successful termination
-                    self.service_to_runtime_ack.send(MGMT_RESPONSE.TERMINATED)
-                    self.join()
-                    return
-                elif np.array_equal(command, MGMT_COMMAND.PAUSE):
-                    # Inform all ProcessModels about the PAUSE command
-                    self._send_pm_cmd(command)
-                    rsps = self._get_pm_resp()
-                    for rsp in rsps:
-                        if not np.array_equal(rsp, MGMT_RESPONSE.PAUSED):
-                            raise ValueError(f"Wrong Response Received : {rsp}")
-                    # Inform the runtime about successful pausing
-                    self.service_to_runtime_ack.send(MGMT_RESPONSE.PAUSED)
-                    break
-                else:
-                    # The number of time steps was received ("command")
-                    # Start iterating through Loihi phases
-                    curr_time_step = 0
-                    phase = LoihiPyRuntimeService.Phase.HOST
-                    while True:
-                        # Check if it is the last time step
-                        is_last_ts = np.array_equal(enum_to_np(curr_time_step),
-                                                    command)
-                        # Advance to the next phase
-                        phase = self._next_phase(phase, is_last_ts)
-                        # Increase time step if spiking phase
-                        if np.array_equal(phase,
-                                          LoihiPyRuntimeService.Phase.SPK):
-                            curr_time_step += 1
-                        # Inform ProcessModels about current phase
-                        self._send_pm_cmd(phase)
-                        # ProcessModels respond with DONE if not HOST phase
-                        if not np.array_equal(
-                                phase, LoihiPyRuntimeService.Phase.HOST):
-                            rsps = self._get_pm_resp()
-                            for rsp in rsps:
-                                if not np.array_equal(rsp, MGMT_RESPONSE.DONE):
-                                    raise ValueError(
-                                        f"Wrong Response Received : {rsp}")
-
-                        # If HOST phase (last time step ended) break the loop
-                        if np.array_equal(
-                                phase, LoihiPyRuntimeService.Phase.HOST):
-                            break
-
-                    # Inform the runtime that last time step was reached
-                    self.service_to_runtime_ack.send(MGMT_RESPONSE.DONE)
+            # Block until the next command from the runtime arrives
+            command = recv_cmd()
+            if np.array_equal(command, MGMT_COMMAND.STOP):
+                # Inform all ProcessModels about the STOP command
+                self._send_pm_cmd(command)
+                rsps = self._get_pm_resp()
+                for rsp in rsps:
+                    if not np.array_equal(rsp, MGMT_RESPONSE.TERMINATED):
+                        raise ValueError(f"Wrong Response Received : {rsp}")
+                # Inform the runtime about successful termination
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.TERMINATED)
+                self.join()
+                return
+            elif np.array_equal(command, MGMT_COMMAND.PAUSE):
+                # Inform all ProcessModels about the PAUSE command
+                self._send_pm_cmd(command)
+                rsps = self._get_pm_resp()
+                for rsp in rsps:
+                    if not np.array_equal(rsp, MGMT_RESPONSE.PAUSED):
+                        raise ValueError(f"Wrong Response Received : {rsp}")
+                # Inform the runtime about successful pausing
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.PAUSED)
+                break
+            elif np.array_equal(command, MGMT_COMMAND.RUN_CONTINUOUS):
+                # ToDo: Iterating through the Loihi phases without a limit on
+                #  the number of time steps is not supported yet, so the
+                #  ProcessModels stay idle until the next command
+                pass
+            else:
+                # The number of time steps was received ("command")
+                # Start iterating through Loihi phases
+                curr_time_step = 0
+                phase = LoihiPyRuntimeService.Phase.HOST
+                while True:
+                    # Check if it is the last time step
+                    is_last_ts = np.array_equal(enum_to_np(curr_time_step),
+                                                command)
+                    # Advance to the next phase
+                    phase = self._next_phase(phase, is_last_ts)
+                    # Increase time step if spiking phase
+                    if np.array_equal(phase,
+                                      LoihiPyRuntimeService.Phase.SPK):
+                        curr_time_step += 1
+                    # Inform ProcessModels about current phase
+                    self._send_pm_cmd(phase)
+                    # ProcessModels respond with DONE if not HOST phase
+                    if not np.array_equal(
+                            phase, LoihiPyRuntimeService.Phase.HOST):
+                        rsps = self._get_pm_resp()
+                        for rsp in rsps:
+                            if not np.array_equal(rsp, MGMT_RESPONSE.DONE):
+                                raise ValueError(
+                                    f"Wrong Response Received : {rsp}")
+
+                    # If HOST phase (last time step ended) break the loop
+                    if np.array_equal(
+                            phase, LoihiPyRuntimeService.Phase.HOST):
+                        break
+
+                # Inform the runtime that last time step was reached
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.DONE)
 
             # Handle get/set Var
             self._handle_get_set(phase)
@@ -294,35 +282,44 @@ class AsyncPyRuntimeService(LoihiPyRuntimeService):
         for stop_send_port in self.service_to_process_cmd:
             stop_send_port.send(cmd)
 
-    def _get_pm_resp(self) -> ty.Iterable[MGMT_RESPONSE]:
-        rcv_msgs = []
-        for ptos_recv_port in self.process_to_service_ack:
-            rcv_msgs.append(ptos_recv_port.recv())
-
-        return rcv_msgs
-
     # FixMe: (AW) This is not thought through. What if an AyncProcModel
     #  has already terminated before the STOP command is send?
     def run(self):
+        recv_cmd = self.runtime_to_service_cmd.recv
         while True:
-            if self.runtime_to_service_cmd.probe():
-                command = self.runtime_to_service_cmd.recv()
-                if np.array_equal(command, MGMT_COMMAND.STOP):
-                    self._send_pm_cmd(command)
-                    rsps = self._get_pm_resp()
-                    for rsp in rsps:
-                        if not np.array_equal(rsp, MGMT_RESPONSE.TERMINATED):
-                            raise ValueError(f"Wrong response received : {rsp}")
-                    self.service_to_runtime_ack.send(MGMT_RESPONSE.TERMINATED)
-                    self.join()
-                    break
-                elif np.array_equal(command, MGMT_COMMAND.PAUSE):
-                    # Inform all ProcessModels about the PAUSE command
-                    self._send_pm_cmd(command)
-                    rsps = self._get_pm_resp()
-                    for rsp in rsps:
-                        if not np.array_equal(rsp, MGMT_RESPONSE.PAUSED):
-                            raise ValueError(f"Wrong Response Received : {rsp}")
-                    # Inform the runtime about successful pausing
-                    self.service_to_runtime_ack.send(MGMT_RESPONSE.PAUSED)
-                    self._handle_get_set(0)
+            # Block until the next command from the runtime arrives
+            command = recv_cmd()
+            if np.array_equal(command, MGMT_COMMAND.STOP):
+                self._send_pm_cmd(command)
+                rsps = self._get_pm_resp()
+                for rsp in rsps:
+                    if not np.array_equal(rsp, MGMT_RESPONSE.TERMINATED):
+                        raise ValueError(f"Wrong response received : {rsp}")
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.TERMINATED)
+                self.join()
+                break
+            elif np.array_equal(command, MGMT_COMMAND.PAUSE):
+                # Inform all ProcessModels about the PAUSE command
+                self._send_pm_cmd(command)
+                rsps = self._get_pm_resp()
+                for rsp in rsps:
+                    if not np.array_equal(rsp, MGMT_RESPONSE.PAUSED):
+                        raise ValueError(f"Wrong Response Received : {rsp}")
+                # Inform the runtime about successful pausing
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.PAUSED)
+                self._handle_get_set(0)
+            elif np.array_equal(command, MGMT_COMMAND.RUN_CONTINUOUS):
+                # The ProcessModels keep running until the next command
+                self._send_pm_cmd(command)
+            else:
+                # The number of steps was received ("command"). Each
+                # ProcessModel calls run() that many times and responds
+                # with DONE afterwards
+                self._send_pm_cmd(command)
+                rsps = self._get_pm_resp()
+                for rsp in rsps:
+                    if not np.array_equal(rsp, MGMT_RESPONSE.DONE):
+                        raise ValueError(f"Wrong Response Received : {rsp}")
+                # Inform the runtime that all steps are done
+                self.service_to_runtime_ack.send(MGMT_RESPONSE.DONE)
+                self._handle_get_set(0)
@@ -25,11 +25,13 @@ class PyLifModel(PyLoihiProcessModel):
     vth: int = LavaPyType(int, int, precision=8)
 
     def run_spk(self):
-        self.u[:] = self.u * ((2 ** 12 - self.du) // 2 ** 12)
+        # Update the state in place to avoid temporary arrays
+        self.u *= (2 ** 12 - self.du) // 2 ** 12
         a_in_data = self.a_in.recv()
-        self.u[:] += a_in_data
-        self.v[:] = self.v * \
-            ((2 ** 12 - self.dv) // 2 ** 12) + self.u + self.bias
+        self.u += a_in_data
+        self.v *= (2 ** 12 - self.dv) // 2 ** 12
+        self.v += self.u
+        self.v += self.bias
         s_out = self.v > self.vth
         self.v[s_out] = 0  # Reset voltage to 0. This is Loihi-1 compatible.
         self.s_out.send(s_out)
@@ -2,7 +2,7 @@ import numpy as np
 from lava.magma.core.process.process import AbstractProcess
 from lava.magma.core.process.variable import Var
 from lava.magma.core.process.ports.ports import InPort, OutPort
-from lava.magma.core.run_conditions import RunContinuous
+from lava.magma.core.run_conditions import RunSteps
 from lava.magma.core.decorator import implements, requires
 from lava.magma.core.model.sub.model import AbstractSubProcessModel
 from lava.magma.core.model.py.model import AbstractPyProcessModel
@@ -26,19 +26,26 @@ class PyLeafProcModel(AbstractPyProcessModel):
     inp: PyInPort = LavaPyType(PyInPort.VEC_DENSE, float)
     out: PyOutPort = LavaPyType(PyOutPort.VEC_DENSE, float)
     var: np.ndarray = LavaPyType(np.ndarray, float)
+    verbose: bool = True
+    """Whether run() prints each update."""
 
     def __init__(self, model_id, name):
         super().__init__(model_id, name)
         self.iteration = 0
 
     def run(self):
+        # Only the first two steps exchange values. The guard is needed on
+        # every call since rebinding 'run' would only take effect with the
+        # next command
         if self.iteration < 2:
-            val = self.inp.recv()
-            print(f"Process={self.name}: "
-                  f"iter={self.iteration}, "
-                  f"var + recv_val = {self.var[0]} + {val[0]} = "
-                  f"{self.var[0]+val[0]}")
-            self.var[:] += val
+            var, val = self.var[0], self.inp.recv()[0]
+            new_val = var + val
+            if self.verbose:
+                print(f"Process={self.name}: "
+                      f"iter={self.iteration}, "
+                      f"var + recv_val = {var} + {val} = "
+                      f"{new_val}")
+            self.var[0] = new_val
             self.out.send(self.var)
             self.iteration += 1
 
@@ -79,28 +86,31 @@ class LeafProcRunCfg(RunConfig):
 
 
 class CompProcRunCfg(RunConfig):
+    def __init__(self):
+        super().__init__()
+        # Selected ProcessModel per list of candidate ProcessModels, which
+        # is the same for all instances of a Process class
+        self._selected_pms = {}
+
     def select(self, process, process_models):
-        selected_pm = None
-        for pm in process_models:
-            if issubclass(pm, AbstractSubProcessModel):
-                selected_pm = pm
-            elif not selected_pm and issubclass(pm, AbstractPyProcessModel):
-                selected_pm = pm
-        return selected_pm
+        key = tuple(process_models)
+        if key not in self._selected_pms:
+            selected_pm = None
+            for pm in process_models:
+                if issubclass(pm, AbstractSubProcessModel):
+                    selected_pm = pm
+                elif not selected_pm and issubclass(pm,
+                                                    AbstractPyProcessModel):
+                    selected_pm = pm
+            self._selected_pms[key] = selected_pm
+        return self._selected_pms[key]
 
 
 def leaf_proc_demo():
     p1, p2, p3 = LeafProc(), LeafProc(), LeafProc()
     p1.out.connect(p2.inp)
     p2.out.connect(p3.inp)
-    p1.run(condition=RunContinuous(), run_cfg=LeafProcRunCfg())
-    print("Running...")
-    import time
-
-    time.sleep(3)
-    print("Pausing")
-    p1.pause()
-    print('Paused')
+    p1.run(condition=RunSteps(num_steps=10), run_cfg=LeafProcRunCfg())
 
     print(p3.var.get())
 
@@ -111,14 +121,7 @@ def leaf_proc_demo():
 
 def comp_proc_demo():
     p = CompositeProc()
-    p.run(condition=RunContinuous(), run_cfg=CompProcRunCfg())
-    print("Running...")
-    import time
-
-    time.sleep(3)
-    print("Pausing")
-    p.pause()
-    print('Paused')
+    p.run(condition=RunSteps(num_steps=10), run_cfg=CompProcRunCfg())
 
     print(p.var.get())
 
@@ -1,9 +1,13 @@
+import threading
+
 import numpy as np
 import unittest
+from queue import Empty
 from multiprocessing import Process
 from multiprocessing.managers import SharedMemoryManager
 
-from lava.magma.compiler.channels.pypychannel import PyPyChannel
+from lava.magma.compiler.channels.pypychannel import PyPyChannel, \
+    CspSelector, start_csp_ports
 
 
 class MockInterface:
@@ -76,6 +80,165 @@ class TestPyPyChannelSingleProcess(unittest.TestCase):
         finally:
             smm.shutdown()
 
+    def test_recv_with_timeout_on_empty_channel(self):
+        smm = SharedMemoryManager()
+        try:
+            smm.start()
+
+            data = np.ones((1,))
+            channel = get_channel(smm, data, size=2)
+
+            channel.src_port.start()
+            channel.dst_port.start()
+
+            with self.assertRaises(Empty):
+                channel.dst_port.recv(timeout=0.01)
+            channel.src_port.send(data=data)
+            result = channel.dst_port.recv(timeout=1)
+            assert np.array_equal(result, data)
+        finally:
+            smm.shutdown()
+
+    def test_send_recv_with_ports_started_together(self):
+        smm = SharedMemoryManager()
+        try:
+            smm.start()
+
+            data = np.ones((2, 2))
+            channel_1 = get_channel(smm, data, size=2, name="channel_1")
+            channel_2 = get_channel(smm, data, size=2, name="channel_2")
+            start_csp_ports([channel_1.src_port, channel_1.dst_port,
+                             channel_2.src_port, channel_2.dst_port])
+
+            # Sending more messages than the channels can hold requires the
+            # acknowledgements to be served by the shared listener thread
+            for i in range(5):
+                channel_1.src_port.send(data=data * i)
+                channel_2.src_port.send(data=data * -i)
+                assert np.array_equal(channel_1.dst_port.recv(), data * i)
+                assert np.array_equal(channel_2.dst_port.recv(), data * -i)
+        finally:
+            smm.shutdown()
+
+    def test_select_returns_action_of_ready_channel(self):
+        smm = SharedMemoryManager()
+        try:
+            smm.start()
+
+            data = np.ones((1,))
+            channel_1 = get_channel(smm, data, size=2, name="channel_1")
+            channel_2 = get_channel(smm, data, size=2, name="channel_2")
+            for port in (channel_1.src_port, channel_1.dst_port,
+                         channel_2.src_port, channel_2.dst_port):
+                port.start()
+
+            channel_2.src_port.send(data=data)
+            selector = CspSelector()
+            result = selector.select((channel_1.dst_port, lambda: 1),
+                                     (channel_2.dst_port, lambda: 2))
+            self.assertEqual(result, 2)
+            assert np.array_equal(channel_2.dst_port.recv(), data)
+        finally:
+            smm.shutdown()
+
+    def test_select_waits_for_channels_written_concurrently(self):
+        """Checks that select() wakes up for channels that only become ready
+        while it waits, with the observers being set and reset while the
+        listener thread notifies them."""
+        smm = SharedMemoryManager()
+        try:
+            smm.start()
+
+            data = np.ones((1,))
+            channel_1 = get_channel(smm, data, size=2, name="channel_1")
+            channel_2 = get_channel(smm, data, size=2, name="channel_2")
+            start_csp_ports([channel_1.src_port, channel_1.dst_port,
+                             channel_2.src_port, channel_2.dst_port])
+            num_msgs = 200
+
+            def write():
+                for i in range(num_msgs):
+                    channel = channel_1 if i % 2 == 0 else channel_2
+                    channel.src_port.send(data=data * i)
+
+            received = []
+
+            def select():
+                selector = CspSelector()
+                recv_1 = channel_1.dst_port.recv
+                recv_2 = channel_2.dst_port.recv
+                for _ in range(num_msgs):
+                    received.append(selector.select(
+                        (channel_1.dst_port, lambda: recv_1(timeout=5)[0]),
+                        (channel_2.dst_port, lambda: recv_2(timeout=5)[0])))
+
+            # Select before anything has been written
+            selecting = threading.Thread(target=select, daemon=True)
+            selecting.start()
+            writing = threading.Thread(target=write, daemon=True)
+            writing.start()
+            writing.join(timeout=30)
+            selecting.join(timeout=30)
+
+            self.assertFalse(selecting.is_alive())
+            self.assertEqual(sorted(received), list(range(num_msgs)))
+        finally:
+            smm.shutdown()
+
+    def test_failed_notify_only_fails_its_port(self):
+        """Checks that a port the shared listener thread fails to notify
+        raises the error from a blocked recv() and send() while the other
+        ports keep working."""
+        smm = SharedMemoryManager()
+        try:
+            smm.start()
+
+            data = np.ones((1,))
+            channel_1 = get_channel(smm, data, size=2, name="channel_1")
+            channel_2 = get_channel(smm, data, size=2, name="channel_2")
+            start_csp_ports([channel_1.src_port, channel_1.dst_port,
+                             channel_2.src_port, channel_2.dst_port])
+
+            def fail():
+                raise ValueError("notify failed")
+
+            channel_1.dst_port._notify = fail
+            errors = []
+
+            def recv():
+                try:
+                    channel_1.dst_port.recv(timeout=5)
+                except Exception as error:
+                    errors.append(error)
+
+            # A recv() that is blocked when notifying its port fails raises
+            # the error instead of waiting for data
+            receiving = threading.Thread(target=recv, daemon=True)
+            receiving.start()
+            channel_1.src_port.send(data=data)
+            receiving.join(timeout=5)
+            self.assertFalse(receiving.is_alive())
+            self.assertIsInstance(errors[0], RuntimeError)
+            self.assertIsInstance(errors[0].__cause__, ValueError)
+            self.assertTrue(channel_1.dst_port.probe())
+
+            # The listener thread keeps serving the other ports
+            for i in range(5):
+                channel_2.src_port.send(data=data * i)
+                assert np.array_equal(channel_2.dst_port.recv(timeout=5),
+                                      data * i)
+
+            # An observer that raises fails the send port once the receiver
+            # acknowledged the message
+            channel_2.src_port.observer = fail
+            channel_2.src_port.send(data=data)
+            channel_2.dst_port.recv(timeout=5)
+            with self.assertRaises(RuntimeError):
+                for _ in range(3):
+                    channel_2.src_port.send(data=data)
+        finally:
+            smm.shutdown()
+
 
 class DummyProcess(Process):
     """Wrapper around multiprocessing.Process to start channels"""
@@ -3,6 +3,7 @@
 # See: https://spdx.org/licenses/
 import unittest
 import typing as ty
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 
@@ -12,7 +13,8 @@ from lava.magma.core.process.ports.ports import InPort, OutPort, RefPort, \
     VarPort
 from lava.magma.core.decorator import implements, requires
 from lava.magma.core.resources import CPU
-from lava.magma.core.model.py.model import AbstractPyProcessModel
+from lava.magma.core.model.py.model import AbstractPyProcessModel, \
+    PyLoihiProcessModel
 from lava.magma.core.model.py.type import LavaPyType
 from lava.magma.core.model.py.ports import PyInPort, PyOutPort, PyRefPort, \
     PyVarPort
@@ -21,6 +23,7 @@ from lava.magma.compiler.utils import VarInitializer, PortInitializer, \
     VarPortInitializer
 from lava.magma.compiler.builder import PyProcessBuilder
 from lava.magma.compiler.channels.interfaces import AbstractCspPort
+from lava.magma.runtime.mgmt_token_enums import MGMT_RESPONSE
 
 
 # A test Process with a variety of Ports and Vars of different shapes,
@@ -319,6 +322,12 @@ class TestPyProcessBuilder(unittest.TestCase):
         b.set_variables(v)
         b.set_py_ports(py_ports)
         b.set_csp_ports(csp_ports)
+        # The shared memory for get/set of a Var may be larger than the 6
+        # values of the Var
+        shm = SharedMemory(create=True, size=4096)
+        self.addCleanup(shm.unlink)
+        self.addCleanup(shm.close)
+        b.set_var_buffers({proc.v4_tensor.id: (shm, 6)})
 
         # Before we build, we should make sure all vars and ports are set and
         # that there's a CSP port for every PyPort
@@ -328,6 +337,13 @@ class TestPyProcessBuilder(unittest.TestCase):
         # instance
         pm = b.build()
 
+        # The view into the shared memory of a Var is sized after the Var
+        self.assertEqual(pm._get_var_buffer(proc.v4_tensor.id).shape, (6,))
+        with self.assertRaises(RuntimeError):
+            pm._get_var_buffer(proc.v1_scalar.id)
+        # Release the view so that the shared memory can be closed
+        pm._var_buffers = {}
+
         # Thus the ProcModel instance should have PyPort attributes as
         # defined by by the Process and ProcessModel class
         import lava.magma.core.model.py.ports as pts
@@ -339,6 +355,8 @@ class TestPyProcessBuilder(unittest.TestCase):
         # And these ports should have the specified shape
         self.assertEqual(pm.in_port._shape, (2, 1))
         self.assertEqual(pm.out_port._shape, (3, 2))
+        # The builder registers the ports to be started with the ProcModel
+        self.assertEqual(pm.py_ports, [pm.in_port, pm.out_port])
 
         # Similarly, Var attributes should exist with all initial values
         # being broadcast to required shape if necessary
@@ -501,5 +519,92 @@ class TestPyProcessBuilder(unittest.TestCase):
         self.assertEqual(b.csp_ports["var_port"], [csp_ports[2], csp_ports[3]])
 
 
+class TestPyProcessModel(unittest.TestCase):
+    def test_cmd_table(self):
+        """Checks that every command handler is found at the index of its
+        command in the command table."""
+
+        pm = PyLoihiProcessModel(0, "pm")
+        cmd_table, offset = pm._build_cmd_table()
+
+        for cmd, handler in pm._cmd_handlers.items():
+            self.assertEqual(cmd_table[int(cmd) - offset], handler)
+        self.assertEqual(
+            len([h for h in cmd_table if h is not None]),
+            len(pm._cmd_handlers))
+
+    def test_phase_handlers_specialized_by_guards(self):
+        """Checks that phases without a guard only acknowledge the phase while
+        phases with a guard keep calling it."""
+
+        class NoGuards(PyLoihiProcessModel):
+            pass
+
+        class LrnGuard(NoGuards):
+            def lrn_guard(self):
+                return True
+
+        class OwnPreMgmt(LrnGuard):
+            def _pre_mgmt(self):
+                pass
+
+        base = PyLoihiProcessModel
+        self.assertIs(NoGuards._pre_mgmt,
+                      base._ack_phase_and_handle_var_ports)
+        self.assertIs(NoGuards._lrn, base._ack_phase)
+        self.assertIs(LrnGuard._lrn, base.__dict__["_lrn"])
+        self.assertIs(LrnGuard._post_mgmt,
+                      base._ack_phase_and_handle_var_ports)
+        self.assertIs(OwnPreMgmt._pre_mgmt, OwnPreMgmt.__dict__["_pre_mgmt"])
+
+    def test_rebound_run_takes_effect(self):
+        """Checks that _run() calls run() once per step of a run command,
+        acknowledges each run command and calls a run() that was rebound on
+        the instance once the next command arrived."""
+
+        class RebindingModel(AbstractPyProcessModel):
+            def run(self):
+                self.calls.append("first")
+                self.run = self.second_run
+
+            def second_run(self):
+                self.calls.append("second")
+
+            def _handle_get_set_var(self):
+                pass
+
+        class FakeCmdPort:
+            """Returns the given commands one after the other."""
+
+            def __init__(self, cmds):
+                self.cmds = list(cmds)
+
+            def probe(self):
+                return bool(self.cmds)
+
+            def recv(self):
+                return np.array([self.cmds.pop(0)], dtype=np.float64)
+
+        class FakeAckPort:
+            def __init__(self):
+                self.acks = []
+
+            def send(self, data):
+                self.acks.append(int(data[0]))
+
+        pm = RebindingModel(0, "pm")
+        pm.calls = []
+        handled = []
+        pm._cmd_handlers = {-1: lambda: handled.append(-1)}
+        pm.service_to_process_cmd = FakeCmdPort([2, 1, -1])
+        pm.process_to_service_ack = FakeAckPort()
+        pm._run()
+
+        self.assertEqual(pm.calls, ["first", "first", "second"])
+        self.assertEqual(pm.process_to_service_ack.acks,
+                         [MGMT_RESPONSE.DONE_INT] * 2)
+        self.assertEqual(handled, [-1])
+
+
 if __name__ == "__main__":
     unittest.main()
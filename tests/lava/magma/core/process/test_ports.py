@@ -1,6 +1,7 @@
 # Copyright (C) 2021 Intel Corporation
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
+import sys
 import unittest
 from lava.magma.core.process.process import AbstractProcess
 from lava.magma.core.process.ports.ports import (
@@ -35,6 +36,28 @@ class TestPortInitialization(unittest.TestCase):
         self.assertEqual(ref_port.shape, (1, 1, 1))
 
 
+class TestPortDescription(unittest.TestCase):
+    def test_repr_and_describe(self):
+        """Check that repr(..) summarizes a port while describe() lists the
+        names of its connections."""
+
+        class P(AbstractProcess):
+            def __init__(self):
+                super().__init__()
+                self.out_port = OutPort((1, 2))
+                self.in_port = InPort((1, 2))
+
+        p1 = P()
+        p2 = P()
+        p1.out_port.connect(p2.in_port)
+
+        self.assertEqual(repr(p1.out_port),
+                         "OutPort(name='out_port', shape=(1, 2), in=0, out=1)")
+        description = p1.out_port.describe()
+        self.assertIn("OutPort: out_port", description)
+        self.assertIn(f"out_connections: [in_port({p2.name})]", description)
+
+
 class TestIOPorts(unittest.TestCase):
     """Normally ports will only ever be created and used within a parent
     process. However, the tests around establishing connections between ports
@@ -65,6 +88,18 @@ class TestIOPorts(unittest.TestCase):
         with self.assertRaises(AssertionError):
             op.connect(ip)
 
+    def test_connect_reports_first_invalid_port(self):
+        """Check that connecting fails for the first port that is invalid."""
+
+        op = OutPort((1, 2, 3))
+
+        # The first port has a different shape, the second one a different
+        # type than the first one
+        with self.assertRaisesRegex(AssertionError, "Shapes"):
+            op.connect([InPort((3, 2, 1)), OutPort((1, 2, 3))])
+        with self.assertRaisesRegex(AssertionError, "same type"):
+            op.connect([InPort((1, 2, 3)), OutPort((3, 2, 1))])
+
     def test_connect_OutPort_to_many_InPorts(self):
         """Check connecting OutPort directly to multiple InPorts."""
 
@@ -87,6 +122,11 @@ class TestIOPorts(unittest.TestCase):
         self.assertEqual(ip1.in_connections, [op1, op2])
         self.assertEqual(ip2.in_connections, [op1, op2])
 
+        # Ports can also be given as a tuple
+        op3 = OutPort((1, 2, 3))
+        op3.connect((ip1, ip2))
+        self.assertEqual(op3.out_connections, [ip1, ip2])
+
     def test_duplicate_connections(self):
         """Check that connecting the same ports more than once fails."""
 
@@ -101,6 +141,12 @@ class TestIOPorts(unittest.TestCase):
         with self.assertRaises(DuplicateConnectionError):
             op.connect(ip2)
 
+        # ...regardless of the direction the connection is made from
+        with self.assertRaises(DuplicateConnectionError):
+            ip1.connect_from(op)
+        self.assertEqual(op.out_connections, [ip1, ip2])
+        self.assertEqual(ip1.in_connections, [op])
+
     def test_legal_chain_of_connections(self):
         """Check that OutPort to OutPort and InPort to InPort connections can
         can be chained together as would happen in hierarchical processes."""
@@ -198,6 +244,39 @@ class TestIOPorts(unittest.TestCase):
         # ip2 ultimately receives inputs from op1 and op2
         self.assertEqual(ip2.get_src_ports(), [op1, op2])
 
+    def test_getting_src_and_dst_connections_of_deep_chain(self):
+        """Check that source and destination ports can be retrieved from a
+        chain of connections deeper than the recursion limit."""
+
+        ports = [OutPort((1,)) for _ in range(sys.getrecursionlimit() + 10)]
+        for p1, p2 in zip(ports[:-1], ports[1:]):
+            p1.connect(p2)
+
+        self.assertEqual(ports[0].get_dst_ports(), [ports[-1]])
+        self.assertEqual(ports[-1].get_src_ports(), [ports[0]])
+
+    def test_src_and_dst_ports_follow_new_connections(self):
+        """Check that previously retrieved source and destination ports are
+        updated when new connections are made."""
+
+        op1 = OutPort((1, 2, 3))
+        op2 = OutPort((1, 2, 3))
+        ip1 = InPort((1, 2, 3))
+        ip2 = InPort((1, 2, 3))
+
+        op1.connect(ip1)
+        self.assertEqual(op1.get_dst_ports(), [ip1])
+        self.assertEqual(ip1.get_src_ports(), [op1])
+
+        # Modifying a returned list must not affect later results
+        op1.get_dst_ports().append(ip2)
+        self.assertEqual(op1.get_dst_ports(), [ip1])
+
+        op1.connect(ip2)
+        op2.connect(ip1)
+        self.assertEqual(op1.get_dst_ports(), [ip1, ip2])
+        self.assertEqual(ip1.get_src_ports(), [op1, op2])
+
 
 class TestRVPorts(unittest.TestCase):
     """RefPorts and VarPorts enable shared memory access from a RefPort's
@@ -305,6 +384,20 @@ class TestRVPorts(unittest.TestCase):
         with self.assertRaises(AssertionError):
             rp.connect_var(v)
 
+        # Conflicts are detected before any implicit VarPort gets created
+        v2 = Var((1, 2, 3))
+        v2.process = v.process
+        v2.name = "other_attr"
+        rp = RefPort((1, 2, 3))
+        with self.assertRaises(AssertionError):
+            rp.connect_var([v2, v])
+        self.assertFalse(hasattr(v.process, "_other_attr_implicit_port"))
+
+        # ... which includes the same Var being given twice
+        with self.assertRaises(AssertionError):
+            rp.connect_var([v2, v2])
+        self.assertFalse(hasattr(v.process, "_other_attr_implicit_port"))
+
     def test_connect_RefPort_to_many_Vars(self):
         """Checks that RefPort can be connected to many Vars."""
 
@@ -334,6 +427,16 @@ class TestRVPorts(unittest.TestCase):
         with self.assertRaises(AssertionError):
             rp.connect_var([v1, v2])
 
+        # The check happens before any implicit VarPort gets created
+        class VarProcess(AbstractProcess):
+            ...
+
+        v1.process = VarProcess()
+        rp = RefPort((1, 2, 3))
+        with self.assertRaises(AssertionError):
+            rp.connect_var([v1, v2])
+        self.assertTrue(v1.process.var_ports.is_empty)
+
     def test_connect_RefPort_to_non_sharable_Var(self):
         """Check that RefPorts can only cannot to shareable Vars."""
 
@@ -479,6 +582,12 @@ class TestVirtualPorts(unittest.TestCase):
         with self.assertRaises(ConcatShapeError):
             op1.concat_with(op2, axis=0)
 
+        # Incompatible shapes are detected no matter where they occur among
+        # the concatenated ports
+        op3 = OutPort((2, 4, 1))
+        with self.assertRaises(ConcatShapeError):
+            op1.concat_with([op2, op3], axis=0)
+
         # Create another port with incompatible type
         ip = InPort((2, 3, 1))
         # This will fail because concatenated ports must be of same type
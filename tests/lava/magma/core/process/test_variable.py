@@ -1,8 +1,12 @@
 # Copyright (C) 2021 Intel Corporation
 # SPDX-License-Identifier: BSD-3-Clause
 # See: https://spdx.org/licenses/
+import gc
+import threading
 import unittest
 
+import numpy as np
+
 from lava.magma.core.process.process import AbstractProcess
 from lava.magma.core.process.variable import Var, VarServer
 
@@ -31,6 +35,38 @@ class TestVarInitialization(unittest.TestCase):
         v3 = Var(shape=(1,))
         self.assertEqual(v3.id, 2)
 
+    def test_var_server_does_not_keep_vars_alive(self):
+        """Check that the VarServer only keeps track of Vars still in use."""
+
+        vs = VarServer()
+        v1 = Var(shape=(1,))
+        v2 = Var(shape=(1,))
+        self.assertIs(vs.vars[v1.id], v1)
+        self.assertEqual(vs.num_vars, 2)
+
+        v2_id = v2.id
+        del v2
+        gc.collect()
+        self.assertNotIn(v2_id, vs.vars)
+        # Ids of released Vars do not get reused
+        self.assertEqual(vs.num_vars, 2)
+        self.assertEqual(Var(shape=(1,)).id, 2)
+
+    def test_var_server_is_created_once_by_concurrent_threads(self):
+        """Check that concurrent first calls all get the same VarServer."""
+
+        VarServer.reset_singleton()
+        servers = []
+        threads = [threading.Thread(target=lambda: servers.append(VarServer()))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(servers), 8)
+        self.assertTrue(all(s is servers[0] for s in servers))
+        self.assertEqual(servers[0].num_vars, 0)
+
     def test_alias(self):
         """Checks definition of 'alias' relationship between variables.
 
@@ -100,17 +136,30 @@ class TestVarInitialization(unittest.TestCase):
 
         # Before a process has been compiled or run, no Runtime has been
         # assigned to a process. Therefore, getting a Var value will only
-        # return the initial value:
-        self.assertEqual(p.var1.get(), 10)
-        self.assertEqual(p.var2.get(), [20, 30])
-        # Otherwise it would return the value broadcast to the full shape of
-        # the Var from the ProcessModel created at runtime.
+        # return the initial value broadcast to the shape of the Var, just
+        # like the ProcessModel created at runtime would:
+        np.testing.assert_array_equal(p.var1.get(), np.array([10]))
+        np.testing.assert_array_equal(p.var2.get(), np.array([[20, 30]]))
+        # Like with a Runtime, each call returns a new, writable array
+        value = p.var1.get()
+        self.assertTrue(value.flags.writeable)
+        value[0] = 0
+        np.testing.assert_array_equal(p.var1.get(), np.array([10]))
+        # The returned value follows any change of the initial value
+        p.var1.init = 11
+        np.testing.assert_array_equal(p.var1.get(), np.array([11]))
+        p.var2.init[1] = 31
+        np.testing.assert_array_equal(p.var2.get(), np.array([[20, 31]]))
+        # An initial value that does not broadcast to the shape of the Var is
+        # returned as it is
+        p.var2.init = [1, 2, 3]
+        self.assertEqual(p.var2.get(), [1, 2, 3])
+        self.assertIn("value: [1, 2, 3]", repr(p.var2))
 
         # However, setting a Var before a Runtime has been assigned is not
         # possible because the compiler has already pulled the initial Var
         # value to create the ProcessBuilder which would now ignore any new
         # values assigned to the initial value of the Var.
-        import numpy as np
         with self.assertRaises(ValueError):
             p.var1.set(np.ones((1,)))
         # In the future we could upgrade the ProcessBuilder to get the latest
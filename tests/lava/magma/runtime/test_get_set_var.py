@@ -6,7 +6,8 @@ import numpy as np
 import unittest
 
 from lava.magma.core.decorator import implements, requires
-from lava.magma.core.model.py.model import PyLoihiProcessModel
+from lava.magma.core.model.py.model import AbstractPyProcessModel, \
+    PyLoihiProcessModel
 from lava.magma.core.model.py.type import LavaPyType
 from lava.magma.core.process.process import AbstractProcess
 from lava.magma.core.process.variable import Var
@@ -14,6 +15,7 @@ from lava.magma.core.resources import CPU
 from lava.magma.core.run_conditions import RunSteps
 from lava.magma.core.run_configs import RunConfig
 from lava.magma.core.sync.domain import SyncDomain
+from lava.magma.core.sync.protocols.async_protocol import AsyncProtocol
 from lava.magma.core.sync.protocols.loihi_protocol import LoihiProtocol
 
 
@@ -50,6 +52,38 @@ class SimpleProcessModel(PyLoihiProcessModel):
     v = LavaPyType(np.ndarray, np.float64, precision=32)
 
 
+class GrowingProcess(AbstractProcess):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.u = Var(shape=(2,), init=1)
+
+
+@implements(proc=GrowingProcess, protocol=LoihiProtocol)
+@requires(CPU)
+class GrowingProcessModel(PyLoihiProcessModel):
+    """Replaces its Var with one larger than declared by the Process."""
+    u = LavaPyType(np.ndarray, np.int32, precision=32)
+
+    def run_spk(self):
+        self.u = np.zeros((4,), dtype=np.int32)
+
+
+class CountingProcess(AbstractProcess):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.u = Var(shape=(1,), init=0)
+
+
+@implements(proc=CountingProcess, protocol=AsyncProtocol)
+@requires(CPU)
+class AsyncCountingProcessModel(AbstractPyProcessModel):
+    """Counts the calls of run()."""
+    u = LavaPyType(np.ndarray, np.int32, precision=32)
+
+    def run(self):
+        self.u += 1
+
+
 class TestGetSetVar(unittest.TestCase):
     def test_get_set_var_using_runtime(self):
         """Checks that get_var() method of the runtime retrieves expected
@@ -132,6 +166,74 @@ class TestGetSetVar(unittest.TestCase):
         self.assertEqual(process.runtime.global_time, 15)
         process.stop()
 
+    def test_get_var_with_index(self):
+        """Checks that get_var() applies an index even if it is falsy."""
+        process = SimpleProcess(shape=(2, 2))
+        simple_sync_domain = SyncDomain("simple", LoihiProtocol(), [process])
+        run_config = SimpleRunConfig(sync_domains=[simple_sync_domain])
+        process.run(condition=RunSteps(num_steps=1), run_cfg=run_config)
+
+        expected_result_u = np.array([[7, 8], [9, 10]], dtype=np.int32)
+        assert np.array_equal(process.u.get(idx=0), expected_result_u[0])
+        assert np.array_equal(process.u.get(idx=1), expected_result_u[1])
+        process.stop()
+
+    def test_get_set_var_larger_than_declared(self):
+        """Checks that get_var() and set_var() raise instead of blocking if
+        the values do not fit the Var declared by the Process."""
+        process = GrowingProcess()
+        simple_sync_domain = SyncDomain("simple", LoihiProtocol(), [process])
+        run_config = SimpleRunConfig(sync_domains=[simple_sync_domain])
+        process.run(condition=RunSteps(num_steps=1), run_cfg=run_config)
+        try:
+            with self.assertRaises(ValueError):
+                process.u.set(np.ones((4,), dtype=np.int32))
+            with self.assertRaises(RuntimeError):
+                process.u.get()
+            # The ProcessModel keeps serving requests
+            process.run(condition=RunSteps(num_steps=1), run_cfg=run_config)
+            self.assertEqual(process.runtime.global_time, 2)
+        finally:
+            process.stop()
+        # The shared memory of the Vars is released on stop
+        self.assertEqual(process.runtime._var_buffers, {})
+
+    def test_get_set_var_without_buffer(self):
+        """Checks that get_var() and set_var() raise instead of blocking for a
+        Var without a shared buffer."""
+        process = SimpleProcess(shape=(2, 2))
+        simple_sync_domain = SyncDomain("simple", LoihiProtocol(), [process])
+        run_config = SimpleRunConfig(sync_domains=[simple_sync_domain])
+        process.run(condition=RunSteps(num_steps=1), run_cfg=run_config)
+        try:
+            shm, _ = process.runtime._var_buffers.pop(process.u.id)
+            shm.close()
+            with self.assertRaises(RuntimeError):
+                process.u.get()
+            with self.assertRaises(RuntimeError):
+                process.u.set(np.ones((2, 2), dtype=np.int32))
+            # The other Vars can still be read
+            np.testing.assert_array_equal(
+                process.v.get(), np.array([[1., 2.55], [4.2, 5.1]]))
+        finally:
+            process.stop()
+
+    def test_get_set_var_after_async_run_steps(self):
+        """Checks that an asynchronous ProcessModel calls run() once per step
+        and serves get/set requests after the steps are done."""
+        process = CountingProcess()
+        async_sync_domain = SyncDomain("async", AsyncProtocol(), [process])
+        run_config = SimpleRunConfig(sync_domains=[async_sync_domain])
+        process.run(condition=RunSteps(num_steps=5), run_cfg=run_config)
+        try:
+            np.testing.assert_array_equal(process.u.get(), [5])
+            process.u.set(np.array([10], dtype=np.int32))
+            np.testing.assert_array_equal(process.u.get(), [10])
+            process.run(condition=RunSteps(num_steps=3), run_cfg=run_config)
+            np.testing.assert_array_equal(process.u.get(), [13])
+        finally:
+            process.stop()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,39 @@
+# Copyright (C) 2021 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause
+# See: https://spdx.org/licenses/
+import subprocess
+import sys
+import unittest
+
+
+class TestCollateralDemos(unittest.TestCase):
+    """Runs the demos of the tour through Lava in a separate Python process
+    so that a demo that does not terminate fails instead of blocking the
+    test suite."""
+
+    def run_demo(self, demo: str) -> str:
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "from lava.tutorials.end_to_end import tutorial00_collateral "
+             f"as t; t.{demo}()"],
+            capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_leaf_proc_demo(self):
+        """Checks that the leaf process demo terminates with the final value
+        of the last process in the chain."""
+        out = self.run_demo("leaf_proc_demo")
+        self.assertIn("[6.]", out)
+        self.assertIn("Stopped", out)
+
+    def test_comp_proc_demo(self):
+        """Checks that the composite process demo terminates with the final
+        value of the aliased Var."""
+        out = self.run_demo("comp_proc_demo")
+        self.assertIn("[5.]", out)
+        self.assertIn("Stopped", out)
+
+
+if __name__ == '__main__':
+    unittest.main()